@@ -0,0 +1,219 @@
+# app/ai/evaluator.py
+
+import json
+from typing import Optional
+
+from app.rag.retriever import get_global_retriever
+from app.rag.evidence import (
+    build_evidence_pack,
+    CV_EVIDENCE_QUERIES,
+    PROJECT_EVIDENCE_QUERIES,
+    CV_EVIDENCE_MAX_CHARS,
+    PROJECT_EVIDENCE_MAX_CHARS
+)
+from app.rag.prompt_builder import (
+    build_cv_evaluation_prompt, 
+    build_project_evaluation_prompt,
+    build_final_summary_prompt
+)
+from app.ai.llm_client import call_llm
+from app.core.tracing import timed_stage
+from app.storage.jobs_store import StageCheckpoint
+
+PIPELINE_STAGES = ("cv_result", "project_result", "summary")
+
+
+def parse_llm_json_response(response_text: str) -> dict:
+    """Parse LLM JSON response with fallback."""
+    try:
+        # Try to extract JSON if wrapped in other text
+        start_idx = response_text.find('{')
+        end_idx = response_text.rfind('}') + 1
+        if start_idx != -1 and end_idx != 0:
+            json_str = response_text[start_idx:end_idx]
+            return json.loads(json_str)
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        # Fallback parsing
+        return {"error": "Failed to parse LLM response", "raw": response_text[:200]}
+
+
+def evaluate_cv_pipeline(cv_text: str, job_title: str) -> dict:
+    """
+    CV Evaluation Pipeline.
+    Uses: Job Description + CV Rubric as context.
+    """
+    try:
+        # Retrieve context for CV evaluation
+        retriever = get_global_retriever()
+        with timed_stage("cv.retrieve"):
+            context_chunks = retriever.search_for_cv_evaluation(
+                query=f"{job_title} requirements technical skills"
+            )
+        
+        # Send only rubric-relevant excerpts of long CVs
+        with timed_stage("cv.evidence"):
+            cv_evidence = build_evidence_pack(cv_text, CV_EVIDENCE_QUERIES, CV_EVIDENCE_MAX_CHARS)
+
+        # Build CV evaluation prompt
+        with timed_stage("cv.prompt"):
+            prompt = build_cv_evaluation_prompt(
+                cv_evidence, context_chunks, job_title,
+                context_generation=retriever.generation
+            )
+        
+        # Call LLM
+        llm_output = call_llm(prompt, stage="cv")
+        
+        # Parse response
+        result = parse_llm_json_response(llm_output)
+        
+        # Ensure match_rate is float 0-1
+        match_rate = result.get("match_rate", 0.5)
+        if isinstance(match_rate, str):
+            try:
+                match_rate = float(match_rate)
+            except:
+                match_rate = 0.5
+        
+        return {
+            "match_rate": min(1.0, max(0.0, match_rate)),  # Clamp 0-1
+            "feedback": result.get("feedback", llm_output[:500]),
+            "raw_scores": result.get("scores", {}),
+            "prompt_used": prompt[:200] + "..." if len(prompt) > 200 else prompt
+        }
+    except Exception as e:
+        return {
+            "match_rate": 0.0,
+            "feedback": f"Error in CV evaluation: {str(e)}",
+            "raw_scores": {},
+            "error": str(e)
+        }
+
+
+def evaluate_project_pipeline(project_text: str) -> dict:
+    """
+    Project Evaluation Pipeline.
+    Uses: Case Study Brief + Project Rubric as context.
+    """
+    try:
+        # Retrieve context for project evaluation
+        retriever = get_global_retriever()
+        with timed_stage("project.retrieve"):
+            context_chunks = retriever.search_for_project_evaluation(
+                query="project evaluation case study requirements"
+            )
+        
+        # Send only rubric-relevant excerpts of long reports
+        with timed_stage("project.evidence"):
+            project_evidence = build_evidence_pack(
+                project_text, PROJECT_EVIDENCE_QUERIES, PROJECT_EVIDENCE_MAX_CHARS
+            )
+
+        # Build project evaluation prompt
+        with timed_stage("project.prompt"):
+            prompt = build_project_evaluation_prompt(
+                project_evidence, context_chunks,
+                context_generation=retriever.generation
+            )
+        
+        # Call LLM
+        llm_output = call_llm(prompt, stage="project")
+        
+        # Parse response
+        result = parse_llm_json_response(llm_output)
+        
+        # Ensure project_score is float 1-5
+        project_score = result.get("project_score", 3.0)
+        if isinstance(project_score, str):
+            try:
+                project_score = float(project_score)
+            except:
+                project_score = 3.0
+        
+        return {
+            "project_score": min(5.0, max(1.0, project_score)),  # Clamp 1-5
+            "feedback": result.get("feedback", llm_output[:500]),
+            "raw_scores": result.get("scores", {}),
+            "prompt_used": prompt[:200] + "..." if len(prompt) > 200 else prompt
+        }
+    except Exception as e:
+        return {
+            "project_score": 1.0,
+            "feedback": f"Error in project evaluation: {str(e)}",
+            "raw_scores": {},
+            "error": str(e)
+        }
+
+
+def create_final_summary(cv_result: dict, project_result: dict) -> str:
+    """
+    Create final summary from both evaluations.
+    """
+    try:
+        with timed_stage("summary.prompt"):
+            prompt = build_final_summary_prompt(cv_result, project_result)
+        summary = call_llm(prompt, stage="summary")
+        return summary.strip()
+    except Exception as e:
+        return f"Summary unavailable due to error: {str(e)}"
+
+
+def _stage_succeeded(stage_result: dict) -> bool:
+    return "error" not in stage_result
+
+
+def full_evaluation_pipeline(
+    cv_text: str,
+    project_text: str,
+    job_title: str,
+    checkpoint: Optional[StageCheckpoint] = None
+) -> dict:
+    """
+    Full 3-stage evaluation pipeline.
+    With a checkpoint, each successful stage is saved and skipped on resume.
+    """
+    print(f"Starting evaluation pipeline for: {job_title}")
+    resumed = [s for s in PIPELINE_STAGES if checkpoint and s in checkpoint.completed_stages()]
+    if resumed:
+        print(f"  Resuming after stages: {', '.join(resumed)}")
+
+    def run_stage(stage, fn, should_save=_stage_succeeded):
+        if checkpoint is None:
+            return fn()
+        return checkpoint.run(stage, fn, should_save)
+    
+    # 1. CV Evaluation
+    print("  Stage 1: CV Evaluation")
+    cv_result = run_stage("cv_result", lambda: evaluate_cv_pipeline(cv_text, job_title))
+    
+    # 2. Project Evaluation
+    print("  Stage 2: Project Evaluation")
+    project_result = run_stage("project_result", lambda: evaluate_project_pipeline(project_text))
+    
+    # 3. Final Summary
+    print("  Stage 3: Final Summary")
+    overall_summary = run_stage(
+        "summary",
+        lambda: create_final_summary(cv_result, project_result),
+        should_save=lambda summary: not summary.startswith("Summary unavailable")
+    )
+    
+    # Combine results
+    final_result = {
+        "cv_match_rate": cv_result["match_rate"],
+        "cv_feedback": cv_result["feedback"],
+        "project_score": project_result["project_score"],
+        "project_feedback": project_result["feedback"],
+        "overall_summary": overall_summary,
+        "cv_details": cv_result.get("raw_scores", {}),
+        "project_details": project_result.get("raw_scores", {}),
+        # Stages that fell back to default scores (excluded from rankings)
+        "stage_errors": [
+            stage for stage, stage_result in (("cv", cv_result), ("project", project_result))
+            if not _stage_succeeded(stage_result)
+        ]
+    }
+    
+    print(f"  ✅ Pipeline completed. CV match: {cv_result['match_rate']}, Project score: {project_result['project_score']}")
+    return final_result
@@ -0,0 +1,219 @@
+# app/ai/limiter.py
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+from app.core.scheduler import WaitStats
+
+
+def classify_error(error: Exception) -> str:
+    """
+    "rate_limited" for 429s, "timeout" for timeouts, "error" for anything else.
+    Checked by attribute/name so the OpenAI SDK need not be imported.
+    """
+    name = type(error).__name__
+    if getattr(error, "status_code", None) == 429 or name == "RateLimitError":
+        return "rate_limited"
+    if isinstance(error, TimeoutError) or "Timeout" in name:
+        return "timeout"
+    return "error"
+
+
+# Upper bound for concurrent LLM calls per process; worker pools are sized to it
+LLM_CONCURRENCY_MAX = int(os.getenv("LLM_CONCURRENCY_MAX", "32"))
+
+
+class _LatencyBaseline:
+    """
+    Latency of one stage:model: an EWMA of recent responses, and a baseline
+    at baseline_percentile of the last `window` responses. A low percentile
+    ignores a few unusually fast responses (unlike a minimum) and is not
+    dragged up by a gradual slowdown (unlike an average). Once most of the
+    window is slower, the slower latency becomes the new normal.
+    """
+
+    def __init__(self, smoothing: float, window: int, percentile: float):
+        self.smoothing = smoothing
+        self.percentile = percentile
+        self.smoothed: Optional[float] = None
+        self._window: Deque[float] = deque(maxlen=window)
+
+    @property
+    def samples(self) -> int:
+        return len(self._window)
+
+    def update(self, latency: float):
+        self._window.append(latency)
+        if self.smoothed is None:
+            self.smoothed = latency
+        else:
+            self.smoothed += self.smoothing * (latency - self.smoothed)
+
+    @property
+    def baseline(self) -> float:
+        ordered = sorted(self._window)
+        return ordered[int(self.percentile * (len(ordered) - 1))]
+
+
+class AdaptiveLimiter:
+    """
+    AIMD limit on concurrent LLM calls, so throughput tracks what the
+    provider can actually serve.
+
+    - Additive increase: every call answered at normal latency raises the
+      limit by 1/limit (about +1 per full window of calls), but only while
+      the window is actually in use.
+    - Multiplicative decrease: a 429, a timeout or a smoothed latency
+      above latency_tolerance x baseline multiplies the limit by backoff.
+      Calls sent before the last decrease are ignored, so one burst of
+      failures shrinks the window once rather than once per failed call.
+
+    Latency is tracked per key (stage:model), since prompts of different
+    stages take very different times; see _LatencyBaseline. Inflation is
+    only judged after min_samples responses for a key.
+    """
+
+    def __init__(
+        self,
+        initial_limit: Optional[int] = None,
+        min_limit: Optional[int] = None,
+        max_limit: Optional[int] = None,
+        backoff: float = 0.7,
+        latency_tolerance: Optional[float] = None,
+        smoothing: float = 0.2,
+        baseline_window: int = 500,
+        baseline_percentile: float = 0.25,
+        min_samples: int = 10
+    ):
+        """
+        Limits default to LLM_CONCURRENCY_INITIAL / LLM_CONCURRENCY_MIN /
+        LLM_CONCURRENCY_MAX and the tolerance to LLM_LATENCY_TOLERANCE
+        from the environment.
+        """
+        self.min_limit = min_limit or int(os.getenv("LLM_CONCURRENCY_MIN", "1"))
+        self.max_limit = max_limit or LLM_CONCURRENCY_MAX
+        initial = initial_limit or int(os.getenv("LLM_CONCURRENCY_INITIAL", "8"))
+        self.backoff = backoff
+        self.latency_tolerance = (
+            latency_tolerance if latency_tolerance is not None
+            else float(os.getenv("LLM_LATENCY_TOLERANCE", "2.0"))
+        )
+        self.smoothing = smoothing
+        self.baseline_window = baseline_window
+        self.baseline_percentile = baseline_percentile
+        self.min_samples = min_samples
+
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self._in_flight = 0
+        self._waiting = 0
+        self._last_decrease = 0.0
+        self._baselines: Dict[str, _LatencyBaseline] = {}
+        self._adjustments = {"increase": 0, "rate_limited": 0, "timeout": 0, "latency": 0}
+        self._wait_stats = WaitStats()
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    def acquire(self) -> float:
+        """
+        Block until a slot is free. Returns the seconds spent waiting.
+        """
+        start = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._waiting -= 1
+            self._in_flight += 1
+            wait = time.monotonic() - start
+            self._wait_stats.record(wait)
+        return wait
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot only if one is free right now (used for hedged requests).
+        """
+        with self._cond:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def observe(self, key: str, latency: float, started_at: float, error: Optional[Exception] = None):
+        """
+        Feed one provider request back into the limit.
+        started_at is the time.monotonic() at which the request was sent.
+        """
+        reason = classify_error(error) if error is not None else None
+        if reason == "error":
+            # e.g. a malformed request: says nothing about provider capacity
+            return
+
+        with self._cond:
+            if reason is None:
+                baseline = self._baselines.get(key)
+                if baseline is None:
+                    baseline = self._baselines[key] = _LatencyBaseline(
+                        self.smoothing, self.baseline_window, self.baseline_percentile
+                    )
+                baseline.update(latency)
+
+                if (
+                    baseline.samples >= self.min_samples
+                    and baseline.smoothed > baseline.baseline * self.latency_tolerance
+                ):
+                    reason = "latency"
+                else:
+                    self._increase()
+                    return
+
+            if started_at < self._last_decrease:
+                return
+            self._limit = max(float(self.min_limit), self._limit * self.backoff)
+            self._last_decrease = time.monotonic()
+            self._adjustments[reason] += 1
+
+    def _increase(self):
+        # Only grow a window that is actually used
+        if self._waiting == 0 and self._in_flight * 2 < self.limit:
+            return
+        before = self.limit
+        self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+        if self.limit > before:
+            self._adjustments["increase"] += 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "queue_wait_seconds": self._wait_stats.snapshot(),
+                "adjustments": dict(self._adjustments),
+                "latency": {
+                    key: {"smoothed": round(b.smoothed, 3), "baseline": round(b.baseline, 3)}
+                    for key, b in self._baselines.items()
+                },
+            }
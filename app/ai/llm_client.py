@@ -1,24 +1,73 @@
 # app/ai/llm_client.py
 
 import os
-from openai import OpenAI
-from dotenv import load_dotenv
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Set
 
-load_dotenv()
+from app.ai.limiter import AdaptiveLimiter
+from app.config import load_env
+from app.core.tracing import current_trace
 
-client = OpenAI(
-    api_key=os.getenv("OPENROUTER_API_KEY"),
-    base_url="https://openrouter.ai/api/v1"
-)
+_client = None
+_client_lock = threading.Lock()
 
 
-def call_llm(prompt: str) -> str:
+def get_client():
     """
-    Call LLM via OpenRouter.
-    Returns raw text output.
+    OpenAI-compatible client, created (and the SDK imported) on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                load_env()
+                from openai import OpenAI
+
+                _client = OpenAI(
+                    api_key=os.getenv("OPENROUTER_API_KEY"),
+                    # Override to point at a local OpenAI-compatible stub for testing
+                    base_url=os.getenv("LLM_BASE_URL", "https://openrouter.ai/api/v1"),
+                    timeout=float(os.getenv("LLM_TIMEOUT", "60"))
+                )
+    return _client
+
+
+DEFAULT_MODEL = "google/gemma-2-9b-it"
+
+
+def _env_models(name: str, default: List[str]) -> List[str]:
+    """
+    Read a comma-separated model list from the environment.
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    return [m.strip() for m in value.split(",") if m.strip()]
+
+
+def default_routes() -> Dict[str, List[str]]:
+    """
+    Ordered model preference per pipeline stage: primary first, then fallbacks.
+    Every stage keeps DEFAULT_MODEL as its primary; fallbacks are only used
+    while it fails or is demoted.
+    """
+    return {
+        "cv": _env_models("LLM_MODELS_CV", [DEFAULT_MODEL, "google/gemma-2-27b-it"]),
+        "project": _env_models("LLM_MODELS_PROJECT", [DEFAULT_MODEL, "google/gemma-2-27b-it"]),
+        "summary": _env_models("LLM_MODELS_SUMMARY", [DEFAULT_MODEL, "meta-llama/llama-3.1-8b-instruct"]),
+        "default": _env_models("LLM_MODELS_DEFAULT", [DEFAULT_MODEL]),
+    }
+
+
+def _openai_complete(model: str, prompt: str) -> str:
+    """
+    Single chat completion against the configured OpenAI-compatible endpoint.
     """
-    response = client.chat.completions.create(
-        model="google/gemma-2-9b-it",
+    response = get_client().chat.completions.create(
+        model=model,
         messages=[
             {"role": "system", "content": "You are an AI evaluator."},
             {"role": "user", "content": prompt}
@@ -27,3 +76,268 @@ def call_llm(prompt: str) -> str:
     )
 
     return response.choices[0].message.content
+
+
+class ModelStats:
+    """
+    Rolling latency / error window for one model.
+    Samples older than max_age seconds are ignored, so a demoted model is
+    retried once its bad samples age out.
+    """
+
+    def __init__(self, window: int = 100, max_age: float = 300.0):
+        self.max_age = max_age
+        self._samples = deque(maxlen=window)  # (timestamp, latency_seconds, ok)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        with self._lock:
+            self._samples.append((time.monotonic(), latency, ok))
+
+    def _recent(self) -> List[tuple]:
+        cutoff = time.monotonic() - self.max_age
+        with self._lock:
+            return [(latency, ok) for ts, latency, ok in self._samples if ts >= cutoff]
+
+    def count(self) -> int:
+        return len(self._recent())
+
+    def p95(self) -> float:
+        latencies = sorted(latency for latency, _ in self._recent())
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    def error_rate(self) -> float:
+        samples = self._recent()
+        if not samples:
+            return 0.0
+        return sum(1 for _, ok in samples if not ok) / len(samples)
+
+    def snapshot(self) -> Dict:
+        return {
+            "samples": self.count(),
+            "p95_latency": round(self.p95(), 3),
+            "error_rate": round(self.error_rate(), 3),
+        }
+
+
+class ModelRouter:
+    """
+    Routes each pipeline stage to a model, with health-based failover.
+
+    - A model whose rolling p95 latency or error rate crosses its threshold
+      is demoted behind the healthy fallbacks for that stage.
+    - If the chosen model has not answered after hedge_delay seconds, a
+      duplicate request is sent to the next model and the first success wins.
+    - Concurrent calls are capped by an AdaptiveLimiter (AIMD on 429s,
+      timeouts and latency inflation); callers queue for a slot.
+
+    complete_fn(model, prompt) -> str is injectable so local stubs can stand
+    in for the provider.
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, List[str]]] = None,
+        complete_fn: Callable[[str, str], str] = _openai_complete,
+        latency_threshold: Optional[float] = None,
+        error_threshold: Optional[float] = None,
+        hedge_delay: Optional[float] = None,
+        min_samples: int = 5,
+        window: int = 100,
+        max_workers: Optional[int] = None,
+        limiter: Optional[AdaptiveLimiter] = None
+    ):
+        """
+        Thresholds default to LLM_P95_THRESHOLD / LLM_ERROR_THRESHOLD /
+        LLM_HEDGE_DELAY from the environment; a hedge_delay <= 0 disables hedging.
+        Stages with no models use the "default" route, which must not be empty.
+        """
+        self.routes = routes or default_routes()
+        if not self.routes.get("default"):
+            raise ValueError("No models configured for stage 'default' (LLM_MODELS_DEFAULT)")
+        self.complete_fn = complete_fn
+        self.latency_threshold = (
+            latency_threshold if latency_threshold is not None
+            else float(os.getenv("LLM_P95_THRESHOLD", "30"))
+        )
+        self.error_threshold = (
+            error_threshold if error_threshold is not None
+            else float(os.getenv("LLM_ERROR_THRESHOLD", "0.5"))
+        )
+        self.hedge_delay = (
+            hedge_delay if hedge_delay is not None
+            else float(os.getenv("LLM_HEDGE_DELAY", "15"))
+        )
+        self.min_samples = min_samples
+        self.window = window
+
+        self.limiter = limiter or AdaptiveLimiter()
+
+        self._stats: Dict[str, ModelStats] = {}
+        self._stats_lock = threading.Lock()
+        # Admitted calls plus hedges never exceed the limit; leave headroom
+        # for requests that outlive their caller (losing hedges)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or 2 * self.limiter.max_limit,
+            thread_name_prefix="llm"
+        )
+
+    def _get_stats(self, model: str) -> ModelStats:
+        with self._stats_lock:
+            if model not in self._stats:
+                self._stats[model] = ModelStats(self.window)
+            return self._stats[model]
+
+    def is_healthy(self, model: str) -> bool:
+        stats = self._get_stats(model)
+        if stats.count() < self.min_samples:
+            return True
+        return (
+            stats.p95() <= self.latency_threshold
+            and stats.error_rate() <= self.error_threshold
+        )
+
+    def candidates(self, stage: str) -> List[str]:
+        """
+        Models for a stage: healthy ones in configured order, then unhealthy
+        ones as a last resort.
+        """
+        models = self.routes.get(stage) or self.routes["default"]
+        healthy = [m for m in models if self.is_healthy(m)]
+        return healthy + [m for m in models if m not in healthy]
+
+    def _timed_call(self, model: str, prompt: str, stage: str) -> str:
+        start = time.monotonic()
+        try:
+            result = self.complete_fn(model, prompt)
+        except Exception as e:
+            latency = time.monotonic() - start
+            self._get_stats(model).record(latency, ok=False)
+            self.limiter.observe(f"{stage}:{model}", latency, start, error=e)
+            raise
+        latency = time.monotonic() - start
+        self._get_stats(model).record(latency, ok=True)
+        self.limiter.observe(f"{stage}:{model}", latency, start)
+        return result
+
+    def _hedge_call(self, model: str, prompt: str, stage: str) -> str:
+        try:
+            return self._timed_call(model, prompt, stage)
+        finally:
+            self.limiter.release()
+
+    def _call_hedged(
+        self,
+        model: str,
+        backup: Optional[str],
+        prompt: str,
+        stage: str,
+        tried: Set[str]
+    ) -> str:
+        tried.add(model)
+        primary = self._executor.submit(self._timed_call, model, prompt, stage)
+
+        if backup is None or self.hedge_delay <= 0:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=self.hedge_delay)
+        if done:
+            return primary.result()
+
+        # Primary is slow: race a duplicate against the backup model, but
+        # only with a spare concurrency slot (a hedge is a real request)
+        if not self.limiter.try_acquire():
+            return primary.result()
+        tried.add(backup)
+        pending = {primary, self._executor.submit(self._hedge_call, backup, prompt, stage)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def call(self, prompt: str, stage: str = "default") -> str:
+        """
+        One logical LLM call: wait for a concurrency slot, then try the
+        stage's models in order.
+        """
+        with self.limiter.slot():
+            return self._call_with_failover(prompt, stage)
+
+    def _call_with_failover(self, prompt: str, stage: str) -> str:
+        models = self.candidates(stage)
+        tried: Set[str] = set()
+        last_error: Optional[Exception] = None
+
+        for idx, model in enumerate(models):
+            if model in tried:
+                continue
+            remaining = [m for m in models[idx + 1:] if m not in tried]
+            backup = remaining[0] if remaining else None
+            try:
+                return self._call_hedged(model, backup, prompt, stage, tried)
+            except Exception as e:
+                last_error = e
+                print(f"⚠️ LLM call failed on {model} (stage={stage}): {e}")
+
+        if last_error is None:
+            raise RuntimeError(f"No models configured for stage {stage!r}")
+        raise last_error
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._stats_lock:
+            models = list(self._stats)
+        return {model: self._get_stats(model).snapshot() for model in models}
+
+
+# Global router
+_model_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """
+    Global router, built on first use (after .env is loaded).
+    """
+    global _model_router
+    if _model_router is None:
+        with _router_lock:
+            if _model_router is None:
+                load_env()
+                _model_router = ModelRouter()
+    return _model_router
+
+
+def set_model_router(router: ModelRouter):
+    """
+    Replace the global router (offline replay, local stubs).
+    """
+    global _model_router
+    with _router_lock:
+        _model_router = router
+
+
+def call_llm(prompt: str, stage: str = "default") -> str:
+    """
+    Call LLM via OpenRouter.
+    Routes to the model configured for the given pipeline stage.
+    Returns raw text output.
+    When the current job is being traced, the prompt and response are recorded.
+    """
+    trace = current_trace()
+    if trace is None:
+        return get_model_router().call(prompt, stage=stage)
+
+    start = time.perf_counter()
+    try:
+        response = get_model_router().call(prompt, stage=stage)
+    except Exception as e:
+        trace.add_llm_call(stage, prompt, None, time.perf_counter() - start, error=str(e))
+        raise
+    trace.add_llm_call(stage, prompt, response, time.perf_counter() - start)
+    return response
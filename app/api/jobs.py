@@ -1,205 +1,160 @@
 # app/api/jobs.py
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Header, Query
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime, timezone
 from pathlib import Path
-import json
-
-from app.core.job_manager import JobManager
-from app.core.worker import AsyncWorker
-from app.rag.retriever import global_retriever, build_retriever
-from app.rag.prompt_builder import (
-    build_cv_evaluation_prompt, 
-    build_project_evaluation_prompt,
-    build_final_summary_prompt
-)
-from app.ai.llm_client import call_llm
-from app.utils.pdf_reader import extract_text_from_pdf
+from typing import Optional
+import hashlib
+import os
+import uuid
+
+from app.core.job_manager import JobManager, SharedJobManager, JobStatus, IdempotencyKeyConflict
+from app.core.worker import AsyncWorker, SharedQueueDispatcher, DEFAULT_JOB_TITLE
+from app.core.scheduler import Priority
+from app.core.ranking import RankingIndex, SharedRankingIndex
+from app.ai.evaluator import full_evaluation_pipeline
+from app.storage.jobs_store import SharedJobStore
+from app.utils.pdf_reader import file_fingerprint
 
 router = APIRouter()
 
+# "single": jobs run in threads of this process (default)
+# "multiprocess": jobs go to a shared SQLite queue drained by
+#                 scripts/run_workers.py; any number of API processes
+#                 (uvicorn --workers N) can serve status lookups
+DEPLOYMENT_MODE = os.getenv("DEPLOYMENT_MODE", "single")
+
 # Singletons
-job_manager = JobManager()
-worker = AsyncWorker(job_manager)
+if DEPLOYMENT_MODE == "multiprocess":
+    shared_store = SharedJobStore()
+    job_manager = SharedJobManager(shared_store)
+    worker = SharedQueueDispatcher(shared_store)
+    ranking_index = SharedRankingIndex(shared_store)
+else:
+    job_manager = JobManager()
+    worker = AsyncWorker(job_manager)
+    ranking_index = RankingIndex()
+    job_manager.add_completion_listener(ranking_index.on_job_completed)
+    job_manager.add_eviction_listener(ranking_index.on_job_evicted)
 
 UPLOAD_DIR = Path("data/uploads")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Bump whenever prompts/parsing change, so old results are not reused
+PIPELINE_VERSION = "2"
 
-def parse_llm_json_response(response_text: str) -> dict:
-    """Parse LLM JSON response with fallback."""
-    try:
-        # Try to extract JSON if wrapped in other text
-        start_idx = response_text.find('{')
-        end_idx = response_text.rfind('}') + 1
-        if start_idx != -1 and end_idx != 0:
-            json_str = response_text[start_idx:end_idx]
-            return json.loads(json_str)
-        return json.loads(response_text)
-    except json.JSONDecodeError:
-        # Fallback parsing
-        return {"error": "Failed to parse LLM response", "raw": response_text[:200]}
-
-
-def evaluate_cv_pipeline(cv_text: str, job_title: str) -> dict:
+
+def evaluation_key(cv_hash: str, project_hash: str, job_title: str) -> str:
     """
-    CV Evaluation Pipeline.
-    Uses: Job Description + CV Rubric as context.
+    Dedup key for an evaluation: identical inputs -> identical key.
     """
-    try:
-        # Retrieve context for CV evaluation
-        context_chunks = global_retriever.search_for_cv_evaluation(
-            query=f"{job_title} requirements technical skills"
-        )
-        
-        # Build CV evaluation prompt
-        prompt = build_cv_evaluation_prompt(cv_text, context_chunks, job_title)
-        
-        # Call LLM
-        llm_output = call_llm(prompt)
-        
-        # Parse response
-        result = parse_llm_json_response(llm_output)
-        
-        # Ensure match_rate is float 0-1
-        match_rate = result.get("match_rate", 0.5)
-        if isinstance(match_rate, str):
-            try:
-                match_rate = float(match_rate)
-            except:
-                match_rate = 0.5
-        
-        return {
-            "match_rate": min(1.0, max(0.0, match_rate)),  # Clamp 0-1
-            "feedback": result.get("feedback", llm_output[:500]),
-            "raw_scores": result.get("scores", {}),
-            "prompt_used": prompt[:200] + "..." if len(prompt) > 200 else prompt
-        }
-    except Exception as e:
-        return {
-            "match_rate": 0.0,
-            "feedback": f"Error in CV evaluation: {str(e)}",
-            "raw_scores": {},
-            "error": str(e)
-        }
+    raw = "|".join([cv_hash, project_hash, job_title, PIPELINE_VERSION])
+    return hashlib.sha256(raw.encode()).hexdigest()
 
 
-def evaluate_project_pipeline(project_text: str) -> dict:
-    """
-    Project Evaluation Pipeline.
-    Uses: Case Study Brief + Project Rubric as context.
-    """
-    try:
-        # Retrieve context for project evaluation
-        context_chunks = global_retriever.search_for_project_evaluation(
-            query="project evaluation case study requirements"
+def _validate_priority(priority: str):
+    if priority not in Priority.ALL:
+        raise HTTPException(
+            status_code=400,
+            detail=f"priority must be one of: {', '.join(Priority.ALL)}"
         )
-        
-        # Build project evaluation prompt
-        prompt = build_project_evaluation_prompt(project_text, context_chunks)
-        
-        # Call LLM
-        llm_output = call_llm(prompt)
-        
-        # Parse response
-        result = parse_llm_json_response(llm_output)
-        
-        # Ensure project_score is float 1-5
-        project_score = result.get("project_score", 3.0)
-        if isinstance(project_score, str):
-            try:
-                project_score = float(project_score)
-            except:
-                project_score = 3.0
-        
-        return {
-            "project_score": min(5.0, max(1.0, project_score)),  # Clamp 1-5
-            "feedback": result.get("feedback", llm_output[:500]),
-            "raw_scores": result.get("scores", {}),
-            "prompt_used": prompt[:200] + "..." if len(prompt) > 200 else prompt
-        }
-    except Exception as e:
-        return {
-            "project_score": 1.0,
-            "feedback": f"Error in project evaluation: {str(e)}",
-            "raw_scores": {},
-            "error": str(e)
-        }
 
 
-def create_final_summary(cv_result: dict, project_result: dict) -> str:
+def _get_or_create_job(dedup_key: str, idempotency_key: Optional[str], job_title: str):
     """
-    Create final summary from both evaluations.
+    job_manager.get_or_create_job, with a reused Idempotency-Key for a
+    different payload reported as 409 Conflict.
     """
     try:
-        prompt = build_final_summary_prompt(cv_result, project_result)
-        summary = call_llm(prompt)
-        return summary.strip()
-    except Exception as e:
-        return f"Summary unavailable due to error: {str(e)}"
+        return job_manager.get_or_create_job(dedup_key, idempotency_key, job_title)
+    except IdempotencyKeyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
-def full_evaluation_pipeline(cv_text: str, project_text: str, job_title: str) -> dict:
+def _duplicate_response(job_id: str) -> dict:
+    job = job_manager.get_job(job_id)
+    return {
+        "job_id": job_id,
+        "status": job.status.value,
+        "deduplicated": True,
+        "message": "Identical evaluation already submitted. Returning existing job."
+    }
+
+
+def recover_interrupted_jobs() -> int:
     """
-    Full 3-stage evaluation pipeline.
+    Re-enqueue jobs interrupted by the previous process (call on startup).
     """
-    print(f"Starting evaluation pipeline for: {job_title}")
-    
-    # 1. CV Evaluation
-    print("  Stage 1: CV Evaluation")
-    cv_result = evaluate_cv_pipeline(cv_text, job_title)
-    
-    # 2. Project Evaluation
-    print("  Stage 2: Project Evaluation")
-    project_result = evaluate_project_pipeline(project_text)
-    
-    # 3. Final Summary
-    print("  Stage 3: Final Summary")
-    overall_summary = create_final_summary(cv_result, project_result)
-    
-    # Combine results
-    final_result = {
-        "cv_match_rate": cv_result["match_rate"],
-        "cv_feedback": cv_result["feedback"],
-        "project_score": project_result["project_score"],
-        "project_feedback": project_result["feedback"],
-        "overall_summary": overall_summary,
-        "cv_details": cv_result.get("raw_scores", {}),
-        "project_details": project_result.get("raw_scores", {})
-    }
-    
-    print(f"  ✅ Pipeline completed. CV match: {cv_result['match_rate']}, Project score: {project_result['project_score']}")
-    return final_result
+    return worker.recover(full_evaluation_pipeline)
 
 
 @router.post("/jobs/upload")
 async def upload_job(
     cv_pdf: UploadFile = File(...),
-    project_report: UploadFile = File(...)  # CHANGED: job_pdf → project_report
+    project_report: UploadFile = File(...),  # CHANGED: job_pdf → project_report
+    priority: str = Priority.INTERACTIVE,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    tenant_id: str = Header("default", alias="X-Tenant-Id")
 ):
     """
     Upload CV and Project Report (not Job Description).
+    Identical uploads (or a repeated Idempotency-Key) return the existing job;
+    an Idempotency-Key reused for different files is rejected with 409.
+    Bulk callers should pass priority=bulk.
     """
     if not cv_pdf.filename.endswith(".pdf") or not project_report.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    _validate_priority(priority)
     
-    job_id = job_manager.create_job()
-    
+    cv_bytes = await cv_pdf.read()
+    project_bytes = await project_report.read()
+
+    # Hash off the event loop; uploads can be several MB
+    dedup_key = evaluation_key(
+        await run_in_threadpool(lambda: hashlib.sha256(cv_bytes).hexdigest()),
+        await run_in_threadpool(lambda: hashlib.sha256(project_bytes).hexdigest()),
+        DEFAULT_JOB_TITLE
+    )
+
+    # Write the files before the job (and its dedup keys) exists, so a failed
+    # write leaves no queued job behind for retries to be deduplicated onto
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    cv_tmp = UPLOAD_DIR / f"{upload_id}_cv.pdf.tmp"
+    project_tmp = UPLOAD_DIR / f"{upload_id}_project.pdf.tmp"
+    try:
+        await run_in_threadpool(cv_tmp.write_bytes, cv_bytes)
+        await run_in_threadpool(project_tmp.write_bytes, project_bytes)
+        job_id, created = _get_or_create_job(dedup_key, idempotency_key, DEFAULT_JOB_TITLE)
+    except BaseException:
+        cv_tmp.unlink(missing_ok=True)
+        project_tmp.unlink(missing_ok=True)
+        raise
+
+    if not created:
+        cv_tmp.unlink(missing_ok=True)
+        project_tmp.unlink(missing_ok=True)
+        return _duplicate_response(job_id)
+
     # Save files with new naming convention
     cv_path = UPLOAD_DIR / f"{job_id}_cv.pdf"
     project_path = UPLOAD_DIR / f"{job_id}_project.pdf"  # CHANGED: _job → _project
-    
-    with open(cv_path, "wb") as f:
-        f.write(cv_pdf.file.read())
-    
-    with open(project_path, "wb") as f:
-        f.write(project_report.file.read())
-    
+    try:
+        os.replace(cv_tmp, cv_path)
+        os.replace(project_tmp, project_path)
+    except OSError as e:
+        # Failed jobs are not deduplicated onto, so a retry starts a fresh job
+        job_manager.set_failed(job_id, f"Could not store uploaded files: {e}")
+        raise HTTPException(status_code=500, detail="Could not store uploaded files")
+
     # Run async evaluation
     worker.run_job(
         job_id=job_id,
         cv_pdf_path=str(cv_path),
         project_pdf_path=str(project_path),  # CHANGED parameter
-        task_fn=full_evaluation_pipeline  # CHANGED: rag_pipeline → full_evaluation_pipeline
+        task_fn=full_evaluation_pipeline,  # CHANGED: rag_pipeline → full_evaluation_pipeline
+        priority=priority,
+        tenant=tenant_id
     )
     
     return {
@@ -213,28 +168,43 @@ async def upload_job(
 async def evaluate_job(
     job_title: str,
     cv_document_id: str,      # NEW parameter
-    project_document_id: str   # NEW parameter
+    project_document_id: str,  # NEW parameter
+    priority: str = Priority.INTERACTIVE,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    tenant_id: str = Header("default", alias="X-Tenant-Id")
 ):
     """
     Trigger evaluation with specific document IDs.
     This is a simplified version that doesn't require re-upload.
+    Repeated calls for the same documents and job title share one job.
     """
-    # In a real system, you'd look up the documents by ID
-    # For now, we'll create a new job and process
-    job_id = job_manager.create_job()
-    
+    _validate_priority(priority)
+
     # For demo: assume IDs are filenames in uploads directory
     cv_path = UPLOAD_DIR / f"{cv_document_id}_cv.pdf"
     project_path = UPLOAD_DIR / f"{project_document_id}_project.pdf"
     
     if not cv_path.exists() or not project_path.exists():
         raise HTTPException(status_code=404, detail="Document not found")
+
+    # Fingerprinting reads both files; keep it off the event loop
+    dedup_key = evaluation_key(
+        await run_in_threadpool(file_fingerprint, str(cv_path)),
+        await run_in_threadpool(file_fingerprint, str(project_path)),
+        job_title
+    )
+    job_id, created = _get_or_create_job(dedup_key, idempotency_key, job_title)
+    if not created:
+        return _duplicate_response(job_id)
     
     worker.run_job(
         job_id=job_id,
         cv_pdf_path=str(cv_path),
         project_pdf_path=str(project_path),
-        task_fn=full_evaluation_pipeline
+        task_fn=full_evaluation_pipeline,
+        job_title=job_title,
+        priority=priority,
+        tenant=tenant_id
     )
     
     return {
@@ -246,6 +216,62 @@ async def evaluate_job(
     }
 
 
+def _to_epoch(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)  # naive timestamps are UTC
+    return value.timestamp()
+
+
+@router.get("/jobs")
+def list_jobs(
+    status: Optional[JobStatus] = None,
+    job_title: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None
+):
+    """
+    List jobs, most recently updated first.
+    since/until filter on last update time; pass next_cursor back as
+    cursor to fetch the following page.
+    """
+    try:
+        jobs, next_cursor = job_manager.list_jobs(
+            status=status,
+            job_title=job_title,
+            since=_to_epoch(since),
+            until=_to_epoch(until),
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return {
+        "jobs": [job.to_dict() for job in jobs],
+        "next_cursor": next_cursor
+    }
+
+
+@router.get("/jobs/stats")
+def get_job_stats():
+    """
+    Job counts per status.
+    """
+    return {"counts": job_manager.status_counts()}
+
+
+@router.get("/queues")
+def get_queue_stats():
+    """
+    Queue depth and wait-time percentiles per priority class.
+    """
+    return worker.queue_stats()
+
+
 @router.get("/jobs/{job_id}")
 def get_job_result(job_id: str):
     """
@@ -257,15 +283,17 @@ def get_job_result(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Standardize response format
+    record = job.to_dict()
     response = {
         "id": job_id,
-        "status": job.get("status", "unknown"),
-        "created_at": job.get("created_at"),
-        "updated_at": job.get("updated_at")
+        "status": record["status"],
+        "created_at": record["created_at"],
+        "updated_at": record["updated_at"]
     }
     
-    if job.get("status") == "completed" and "result" in job:
-        result = job["result"]
+    if job.status is JobStatus.COMPLETED and job.has_result:
+        # Full body lives in the result store; load it only here
+        result = job_manager.get_result(job_id) or {}
         response["result"] = {
             "cv_match_rate": result.get("cv_match_rate", 0.0),
             "cv_feedback": result.get("cv_feedback", ""),
@@ -274,7 +302,7 @@ def get_job_result(job_id: str):
             "overall_summary": result.get("overall_summary", "")
         }
     
-    elif job.get("status") == "failed":
-        response["error"] = job.get("error", "Unknown error")
+    elif job.status is JobStatus.FAILED:
+        response["error"] = job.error or "Unknown error"
     
     return response
@@ -0,0 +1,20 @@
+# app/api/llm.py
+
+from fastapi import APIRouter
+
+from app.ai.llm_client import get_model_router
+
+router = APIRouter()
+
+
+@router.get("/llm/stats")
+def get_llm_stats():
+    """
+    Adaptive concurrency state (current limit, in-flight calls, queueing
+    delay) and per-model latency / error rates of this process.
+    """
+    model_router = get_model_router()
+    return {
+        "concurrency": model_router.limiter.stats(),
+        "models": model_router.stats(),
+    }
@@ -0,0 +1,37 @@
+# app/api/rankings.py
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.jobs import ranking_index
+
+router = APIRouter()
+
+
+@router.get("/rankings")
+def list_ranked_titles():
+    """
+    Job titles with ranked candidates and their counts.
+    """
+    return {"job_titles": ranking_index.titles()}
+
+
+@router.get("/rankings/{job_title}")
+def get_rankings(job_title: str, top: int = Query(50, ge=1, le=1000)):
+    """
+    Shortlist: best-scoring completed evaluations for a job title.
+    """
+    return {
+        "job_title": job_title,
+        "candidates": ranking_index.top(job_title, top)
+    }
+
+
+@router.get("/rankings/{job_title}/{job_id}")
+def get_candidate_rank(job_title: str, job_id: str):
+    """
+    Rank and percentile of one evaluated candidate within a job title.
+    """
+    position = ranking_index.position(job_title, job_id)
+    if position is None:
+        raise HTTPException(status_code=404, detail="Candidate not ranked for this job title")
+    return position
@@ -0,0 +1,18 @@
+# app/config.py
+
+_env_loaded = False
+
+
+def load_env():
+    """
+    Load .env into os.environ once.
+    Call before importing modules that read configuration at import time.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _env_loaded = True
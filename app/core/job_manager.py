@@ -1,39 +1,150 @@
 # app/core/job_manager.py
 
+import os
+import threading
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, Optional
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
+from app.core.ranking import combined_score, is_rankable
+from app.storage.file_store import ResultStore
+from app.storage.jobs_store import SharedJobStore
 
-class JobStatus:
+
+class JobStatus(str, Enum):
     QUEUED = "queued"
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
 
 
-class JobManager:
+# How long a dedup / idempotency key keeps pointing at its job
+DEDUP_TTL = float(os.getenv("DEDUP_TTL", str(24 * 3600)))
+
+# How long a completed/failed job (and its result file) is kept in memory
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", str(7 * 24 * 3600)))
+
+
+class IdempotencyKeyConflict(ValueError):
     """
-    In-memory job manager.
-    Responsible ONLY for job lifecycle and state.
+    An Idempotency-Key was reused for a different request payload.
     """
 
-    def __init__(self):
-        self._jobs: Dict[str, Dict] = {}
 
-    def create_job(self) -> str:
-        job_id = str(uuid.uuid4())
+def _iso(timestamp: float) -> str:
+    # Naive UTC, as before, so API timestamps keep their format
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
 
-        self._jobs[job_id] = {
-            "job_id": job_id,
-            "status": JobStatus.QUEUED,
-            "result": None,
-            "error": None,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
+@dataclass(slots=True)
+class JobRecord:
+    """
+    Compact in-memory job state.
+    Timestamps are epoch seconds; the full result body lives in the
+    ResultStore and is loaded only on demand (has_result tells if it exists).
+    """
+    job_id: str
+    status: JobStatus
+    created_at: float
+    updated_at: float
+    job_title: Optional[str] = None
+    error: Optional[str] = None
+    cv_match_rate: Optional[float] = None
+    project_score: Optional[float] = None
+    has_result: bool = False
+    seq: int = 0  # Sequence number of the last update (index bookkeeping)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "job_title": self.job_title,
+            "error": self.error,
+            "created_at": _iso(self.created_at),
+            "updated_at": _iso(self.updated_at),
         }
 
-        return job_id
+
+class _TimeIndex:
+    """
+    Append-only log of (seq, updated_at, job_id), ordered by both seq and
+    time. A job's entry is live only while job.seq equals the entry's seq
+    (and the job was not evicted); other entries are skipped on read and
+    dropped by compact().
+    """
+
+    __slots__ = ("seqs", "times", "job_ids", "stale")
+
+    def __init__(self):
+        self.seqs = array("q")
+        self.times = array("d")
+        self.job_ids: List[str] = []
+        self.stale = 0
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def append(self, seq: int, timestamp: float, job_id: str):
+        self.seqs.append(seq)
+        self.times.append(timestamp)
+        self.job_ids.append(job_id)
+
+    def compact(self, jobs: Dict[str, "JobRecord"]):
+        live = [
+            i for i, (seq, job_id) in enumerate(zip(self.seqs, self.job_ids))
+            if job_id in jobs and jobs[job_id].seq == seq
+        ]
+        self.seqs = array("q", (self.seqs[i] for i in live))
+        self.times = array("d", (self.times[i] for i in live))
+        self.job_ids = [self.job_ids[i] for i in live]
+        self.stale = 0
+
+    def iter_desc(
+        self,
+        before_seq: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Newest first, starting below before_seq and within [since, until].
+        """
+        hi = len(self.seqs) if before_seq is None else bisect_left(self.seqs, before_seq)
+        if until is not None:
+            hi = min(hi, bisect_right(self.times, until))
+        lo = 0 if since is None else bisect_left(self.times, since)
+
+        for i in range(hi - 1, lo - 1, -1):
+            yield self.seqs[i], self.job_ids[i]
+
+
+class BaseJobManager(ABC):
+    """
+    Interface shared by the in-memory JobManager and the SQLite-backed
+    SharedJobManager: job lifecycle, lookups and completion listeners.
+    """
+
+    def __init__(self):
+        self._completion_listeners: List[Callable[[JobRecord, Dict], None]] = []
+
+    def add_completion_listener(self, listener: Callable[[JobRecord, Dict], None]):
+        """
+        Call listener(job, result) whenever a job completes (e.g. rankings).
+        """
+        self._completion_listeners.append(listener)
+
+    def _notify_completed(self, job: JobRecord, result: Dict):
+        for listener in self._completion_listeners:
+            try:
+                listener(job, result)
+            except Exception as e:
+                print(f"⚠️ Completion listener failed for job {job.job_id}: {e}")
 
     def set_processing(self, job_id: str):
         self._update_job(job_id, status=JobStatus.PROCESSING)
@@ -54,20 +165,479 @@ class JobManager:
             error=error
         )
 
-    def get_job(self, job_id: str) -> Optional[Dict]:
+    @abstractmethod
+    def create_job(self, job_title: Optional[str] = None) -> str:
+        ...
+
+    @abstractmethod
+    def get_or_create_job(
+        self,
+        dedup_key: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        job_title: Optional[str] = None
+    ) -> Tuple[str, bool]:
+        ...
+
+    @abstractmethod
+    def restore_job(self, job_id: str, job_title: Optional[str] = None):
+        ...
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[JobRecord]:
+        ...
+
+    @abstractmethod
+    def list_jobs(
+        self,
+        status: Optional[JobStatus] = None,
+        job_title: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[JobRecord], Optional[str]]:
+        ...
+
+    @abstractmethod
+    def status_counts(self) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    def get_result(self, job_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def _update_job(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[Dict] = None,
+        error: Optional[str] = None,
+    ):
+        ...
+
+
+class JobManager(BaseJobManager):
+    """
+    In-memory job manager.
+    Responsible ONLY for job lifecycle and state.
+
+    Listing is served from time-ordered indexes (all jobs, per status, per
+    job title, per status and title) maintained on every update, so a page
+    costs O(page size) rather than a scan of every job.
+
+    Completed and failed jobs are evicted, result file included,
+    job_retention seconds after they finished.
+    """
+
+    def __init__(self, result_store: Optional[ResultStore] = None, dedup_ttl: float = DEDUP_TTL,
+                 job_retention: float = JOB_RETENTION):
+        super().__init__()
+        self._jobs: Dict[str, JobRecord] = {}
+        self._lock = threading.Lock()
+        self.result_store = result_store or ResultStore()
+
+        # Finished jobs in finishing order: (updated_at, job_id, seq)
+        self.job_retention = job_retention
+        self._finished: Deque[Tuple[float, str, int]] = deque()
+
+        # Single-flight indexes: identical evaluations map to one job.
+        # Idempotency keys also keep the request's dedup key (its payload
+        # hash). Keys expire after dedup_ttl, in registration order.
+        self.dedup_ttl = dedup_ttl
+        self._by_dedup_key: Dict[str, str] = {}
+        self._by_idempotency_key: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._key_expiry: Deque[Tuple[float, bool, str, str]] = deque()
+
+        # Listing indexes, keyed by last update time
+        self._seq = 0
+        self._last_ts = 0.0
+        self._all_index = _TimeIndex()
+        self._status_index: Dict[JobStatus, _TimeIndex] = {s: _TimeIndex() for s in JobStatus}
+        self._title_index: Dict[str, _TimeIndex] = {}
+        self._status_title_index: Dict[Tuple[JobStatus, str], _TimeIndex] = {}
+        self._status_counts: Dict[JobStatus, int] = {s: 0 for s in JobStatus}
+
+        self._eviction_listeners: List[Callable[[JobRecord], None]] = []
+
+    def add_eviction_listener(self, listener: Callable[[JobRecord], None]):
+        """
+        Call listener(job) whenever a finished job is evicted.
+        """
+        self._eviction_listeners.append(listener)
+
+    def create_job(self, job_title: Optional[str] = None) -> str:
+        with self._lock:
+            return self._create_job_locked(job_title=job_title)
+
+    def get_or_create_job(
+        self,
+        dedup_key: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        job_title: Optional[str] = None
+    ) -> Tuple[str, bool]:
+        """
+        Return (job_id, created).
+
+        - Same idempotency key -> always the job created for that key;
+          raises IdempotencyKeyConflict if the payload (dedup key) differs.
+        - Same dedup key -> the queued/processing/completed job for it.
+          Failed jobs are not reused, so a retry re-runs the pipeline.
+
+        Keys are forgotten dedup_ttl seconds after they were registered.
+        """
+        with self._lock:
+            self._expire_keys_locked()
+
+            if idempotency_key and idempotency_key in self._by_idempotency_key:
+                job_id, payload_key = self._by_idempotency_key[idempotency_key]
+                if payload_key != dedup_key:
+                    raise IdempotencyKeyConflict(
+                        f"Idempotency-Key {idempotency_key} was used for a different request"
+                    )
+                if job_id in self._jobs:
+                    return job_id, False
+
+            if dedup_key and dedup_key in self._by_dedup_key:
+                job = self._jobs.get(self._by_dedup_key[dedup_key])
+                if job is not None and job.status is not JobStatus.FAILED:
+                    job_id = job.job_id
+                    if idempotency_key:
+                        self._register_key_locked(True, idempotency_key, job_id, dedup_key)
+                    return job_id, False
+
+            job_id = self._create_job_locked(job_title=job_title)
+            if dedup_key:
+                self._register_key_locked(False, dedup_key, job_id)
+            if idempotency_key:
+                self._register_key_locked(True, idempotency_key, job_id, dedup_key)
+            return job_id, True
+
+    def _register_key_locked(self, idempotent: bool, key: str, job_id: str,
+                             dedup_key: Optional[str] = None):
+        if idempotent:
+            self._by_idempotency_key[key] = (job_id, dedup_key)
+        else:
+            self._by_dedup_key[key] = job_id
+        self._key_expiry.append((time.time() + self.dedup_ttl, idempotent, key, job_id))
+
+    def _expire_keys_locked(self):
+        now = time.time()
+        while self._key_expiry and self._key_expiry[0][0] <= now:
+            _, idempotent, key, job_id = self._key_expiry.popleft()
+            # The key may have been re-registered for a newer job since
+            if idempotent:
+                if self._by_idempotency_key.get(key, (None,))[0] == job_id:
+                    del self._by_idempotency_key[key]
+            elif self._by_dedup_key.get(key) == job_id:
+                del self._by_dedup_key[key]
+
+    def restore_job(self, job_id: str, job_title: Optional[str] = None):
+        """
+        Re-register a job recovered from the checkpoint store as queued.
+        """
+        with self._lock:
+            if job_id not in self._jobs:
+                self._create_job_locked(job_id, job_title)
+
+    def _create_job_locked(self, job_id: Optional[str] = None, job_title: Optional[str] = None) -> str:
+        job_id = job_id or str(uuid.uuid4())
+        now = self._next_timestamp()
+
+        job = JobRecord(
+            job_id=job_id,
+            status=JobStatus.QUEUED,
+            created_at=now,
+            updated_at=now,
+            job_title=job_title,
+        )
+        self._jobs[job_id] = job
+        self._index_locked(job, previous_status=None)
+
+        return job_id
+
+    def _next_timestamp(self) -> float:
+        # Monotonic, so index logs stay sorted by time as well as by seq
+        self._last_ts = max(time.time(), self._last_ts)
+        return self._last_ts
+
+    def _index_locked(self, job: JobRecord, previous_status: Optional[JobStatus]):
+        """
+        Append the job's new state to every index it belongs to; its
+        previous entries become stale. Any index that is now mostly stale
+        is compacted, including ones the job just left.
+        """
+        self._seq += 1
+        job.seq = self._seq
+
+        indexes = [self._all_index, self._status_index[job.status]]
+        if job.job_title is not None:
+            indexes.append(self._title_index.setdefault(job.job_title, _TimeIndex()))
+            indexes.append(
+                self._status_title_index.setdefault((job.status, job.job_title), _TimeIndex())
+            )
+
+        touched = list(indexes)
+        if previous_status is not None:
+            self._status_counts[previous_status] -= 1
+            left = [self._all_index, self._status_index[previous_status]]
+            if job.job_title is not None:
+                left.append(self._title_index[job.job_title])
+                left.append(self._status_title_index[(previous_status, job.job_title)])
+            for index in left:
+                index.stale += 1
+                if all(index is not other for other in touched):
+                    touched.append(index)
+        self._status_counts[job.status] += 1
+
+        for index in indexes:
+            index.append(job.seq, job.updated_at, job.job_id)
+
+        self._compact_locked(touched)
+
+    def _job_indexes_locked(self, job: JobRecord) -> List[_TimeIndex]:
+        indexes = [self._all_index, self._status_index[job.status]]
+        if job.job_title is not None:
+            indexes.append(self._title_index[job.job_title])
+            indexes.append(self._status_title_index[(job.status, job.job_title)])
+        return indexes
+
+    def _compact_locked(self, indexes: List[_TimeIndex]):
+        for index in indexes:
+            if index.stale > 64 and index.stale * 2 > len(index):
+                index.compact(self._jobs)
+
+    def _evict_expired_locked(self) -> List[JobRecord]:
+        """
+        Drop finished jobs older than job_retention. Their index entries
+        become stale; returns the evicted jobs.
+        """
+        cutoff = time.time() - self.job_retention
+        evicted = []
+        while self._finished and self._finished[0][0] < cutoff:
+            _, job_id, seq = self._finished.popleft()
+            job = self._jobs.get(job_id)
+            if job is None or job.seq != seq:
+                continue  # updated again since it finished
+            del self._jobs[job_id]
+            self._status_counts[job.status] -= 1
+            indexes = self._job_indexes_locked(job)
+            for index in indexes:
+                index.stale += 1
+            self._compact_locked(indexes)
+            evicted.append(job)
+        return evicted
+
+    def get_job(self, job_id: str) -> Optional[JobRecord]:
         return self._jobs.get(job_id)
 
+    def list_jobs(
+        self,
+        status: Optional[JobStatus] = None,
+        job_title: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[JobRecord], Optional[str]]:
+        """
+        Jobs ordered by last update (newest first), filtered by status,
+        job title and update-time range [since, until].
+        Returns (page, next_cursor); next_cursor is None on the last page.
+        """
+        before_seq = int(cursor) if cursor else None
+
+        with self._lock:
+            # Every filter combination has its own index, so no row is
+            # read only to be filtered out
+            if status is not None and job_title is not None:
+                index = self._status_title_index.get((status, job_title))
+            elif status is not None:
+                index = self._status_index[status]
+            elif job_title is not None:
+                index = self._title_index.get(job_title)
+            else:
+                index = self._all_index
+            if index is None:
+                return [], None
+
+            page: List[JobRecord] = []
+            last_seq = None
+            for seq, job_id in index.iter_desc(before_seq, since, until):
+                job = self._jobs.get(job_id)
+                if job is None or job.seq != seq:
+                    continue  # stale or evicted entry
+                page.append(job)
+                last_seq = seq
+                if len(page) == limit:
+                    break
+
+        next_cursor = str(last_seq) if len(page) == limit else None
+        return page, next_cursor
+
+    def status_counts(self) -> Dict[str, int]:
+        """
+        Number of jobs per status (O(1), maintained on update).
+        """
+        with self._lock:
+            return {status.value: count for status, count in self._status_counts.items()}
+
+    def get_result(self, job_id: str) -> Optional[Dict]:
+        """
+        Load the full result body of a completed job.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or not job.has_result:
+            return None
+        return self.result_store.load(job_id)
+
     def _update_job(
         self,
         job_id: str,
-        status: str,
+        status: JobStatus,
         result: Optional[Dict] = None,
         error: Optional[str] = None,
     ):
         if job_id not in self._jobs:
             raise ValueError(f"Job {job_id} not found")
 
-        self._jobs[job_id]["status"] = status
-        self._jobs[job_id]["result"] = result
-        self._jobs[job_id]["error"] = error
-        self._jobs[job_id]["updated_at"] = datetime.utcnow().isoformat()
+        # Persist the (large) body outside the lock
+        if result is not None:
+            self.result_store.save(job_id, result)
+
+        with self._lock:
+            job = self._jobs[job_id]
+            previous_status = job.status
+            job.status = status
+            job.error = error
+            job.updated_at = self._next_timestamp()
+            job.has_result = result is not None
+            if result is not None:
+                job.cv_match_rate = result.get("cv_match_rate")
+                job.project_score = result.get("project_score")
+
+            self._index_locked(job, previous_status)
+            if status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                self._finished.append((job.updated_at, job_id, job.seq))
+            evicted = self._evict_expired_locked()
+
+        if status is JobStatus.COMPLETED and result is not None:
+            self._notify_completed(job, result)
+
+        for old_job in evicted:
+            if old_job.has_result:
+                self.result_store.delete(old_job.job_id)
+            for listener in self._eviction_listeners:
+                try:
+                    listener(old_job)
+                except Exception as e:
+                    print(f"⚠️ Eviction listener failed for job {old_job.job_id}: {e}")
+
+
+class SharedJobManager(BaseJobManager):
+    """
+    Job manager backed by SharedJobStore (SQLite).
+    Same interface as JobManager, but state is visible to every API and
+    worker process using the same database file. Completion listeners run
+    in the process that completed the job. Jobs are not evicted, so there
+    are no eviction listeners.
+    """
+
+    def __init__(self, store: SharedJobStore, dedup_ttl: float = DEDUP_TTL):
+        super().__init__()
+        self.store = store
+        self.dedup_ttl = dedup_ttl
+
+    def create_job(self, job_title: Optional[str] = None) -> str:
+        job_id = str(uuid.uuid4())
+        self.store.insert_job(job_id, JobStatus.QUEUED.value, time.time(), job_title)
+        return job_id
+
+    def get_or_create_job(
+        self,
+        dedup_key: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        job_title: Optional[str] = None
+    ) -> Tuple[str, bool]:
+        job_id, created, conflict = self.store.get_or_create_job(
+            str(uuid.uuid4()),
+            JobStatus.QUEUED.value,
+            time.time(),
+            JobStatus.FAILED.value,
+            dedup_key,
+            idempotency_key,
+            job_title,
+            self.dedup_ttl
+        )
+        if conflict:
+            raise IdempotencyKeyConflict(
+                f"Idempotency-Key {idempotency_key} was used for a different request"
+            )
+        return job_id, created
+
+    def restore_job(self, job_id: str, job_title: Optional[str] = None):
+        # Shared state survives restarts; just make sure the record exists
+        if self.store.get_job(job_id) is None:
+            self.store.insert_job(job_id, JobStatus.QUEUED.value, time.time(), job_title)
+
+    @staticmethod
+    def _record(row: Dict[str, Any]) -> JobRecord:
+        return JobRecord(
+            job_id=row["job_id"],
+            status=JobStatus(row["status"]),
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            job_title=row["job_title"],
+            error=row["error"],
+            has_result=row["has_result"],
+        )
+
+    def get_job(self, job_id: str) -> Optional[JobRecord]:
+        row = self.store.get_job(job_id)
+        return self._record(row) if row else None
+
+    def list_jobs(
+        self,
+        status: Optional[JobStatus] = None,
+        job_title: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[JobRecord], Optional[str]]:
+        store_cursor = None
+        if cursor:
+            updated_at, job_id = cursor.split(":", 1)
+            store_cursor = (float(updated_at), job_id)
+
+        rows = self.store.list_jobs(
+            status.value if status else None, job_title, since, until, limit, store_cursor
+        )
+        page = [self._record(row) for row in rows]
+
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = f"{page[-1].updated_at!r}:{page[-1].job_id}"
+        return page, next_cursor
+
+    def status_counts(self) -> Dict[str, int]:
+        counts = self.store.status_counts()
+        return {status.value: counts.get(status.value, 0) for status in JobStatus}
+
+    def get_result(self, job_id: str) -> Optional[Dict]:
+        return self.store.get_result(job_id)
+
+    def _update_job(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[Dict] = None,
+        error: Optional[str] = None,
+    ):
+        # Ranking score is stored alongside the job so every process can rank
+        rank_score = combined_score(result) if result is not None and is_rankable(result) else None
+        if not self.store.update_job(job_id, status.value, time.time(), result, error, rank_score):
+            raise ValueError(f"Job {job_id} not found")
+
+        if status is JobStatus.COMPLETED and result is not None and self._completion_listeners:
+            self._notify_completed(self.get_job(job_id), result)
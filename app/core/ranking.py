@@ -0,0 +1,267 @@
+# app/core/ranking.py
+
+import random
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Combined score weights (all inputs normalized to 0-1)
+CV_WEIGHT = 0.4
+PROJECT_WEIGHT = 0.4
+PARAMETER_WEIGHT = 0.2
+
+# Sorts after every job_id, used to bound ties in rank queries
+_MAX_ID = "\U0010ffff"
+
+
+def _normalize_parameter(value: Any) -> Optional[float]:
+    # Per-parameter rubric scores are 1-5
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return min(1.0, max(0.0, (float(value) - 1.0) / 4.0))
+
+
+def combined_score(result: Dict[str, Any]) -> float:
+    """
+    Single ranking score (0-1) for a completed evaluation:
+    cv_match_rate, project_score (1-5) and the mean of the per-parameter
+    rubric scores in cv_details / project_details. Without parameter
+    scores, CV and project share the weight equally.
+    """
+    cv = min(1.0, max(0.0, float(result.get("cv_match_rate") or 0.0)))
+    project = min(1.0, max(0.0, (float(result.get("project_score") or 1.0) - 1.0) / 4.0))
+
+    parameters = [
+        normalized
+        for details in (result.get("cv_details") or {}, result.get("project_details") or {})
+        if isinstance(details, dict)
+        for normalized in map(_normalize_parameter, details.values())
+        if normalized is not None
+    ]
+    if not parameters:
+        return (cv + project) / 2
+
+    return (
+        CV_WEIGHT * cv
+        + PROJECT_WEIGHT * project
+        + PARAMETER_WEIGHT * sum(parameters) / len(parameters)
+    )
+
+
+def is_rankable(result: Dict[str, Any]) -> bool:
+    """
+    Evaluations whose CV or project stage errored carry fallback scores
+    (match_rate 0.0, project_score 1.0) and are not ranked.
+    """
+    return not result.get("stage_errors")
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * levels
+        self.width: List[int] = [1] * levels
+
+
+class _IndexableSkiplist:
+    """
+    Sorted list with O(log n) insert, remove, rank and positional access.
+    Each link stores its width (number of bottom-level hops), so positions
+    can be computed while descending.
+    """
+
+    MAX_LEVELS = 32
+
+    def __init__(self):
+        self.size = 0
+        self.head = _Node(None, self.MAX_LEVELS)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _random_levels(self) -> int:
+        levels = 1
+        while levels < self.MAX_LEVELS and random.random() < 0.5:
+            levels += 1
+        return levels
+
+    def insert(self, key):
+        chain = [self.head] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self.head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._random_levels()
+        new_node = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+
+        self.size += 1
+
+    def remove(self, key):
+        chain = [self.head] * self.MAX_LEVELS
+        node = self.head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+
+        self.size -= 1
+
+    def rank(self, key) -> int:
+        """
+        Number of items strictly smaller than key.
+        """
+        position = 0
+        node = self.head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position
+
+    def head_items(self, count: int) -> List:
+        items = []
+        node = self.head.next[0]
+        while node is not None and len(items) < count:
+            items.append(node.key)
+            node = node.next[0]
+        return items
+
+
+class RankingIndex:
+    """
+    Per-job-title ranking of completed evaluations.
+    Updated incrementally as jobs complete and are evicted (register
+    on_job_completed / on_job_evicted as JobManager listeners). Top-N costs
+    O(log n + N); rank and percentile of a candidate cost O(log n).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_title: Dict[str, _IndexableSkiplist] = {}
+        self._entries: Dict[str, Tuple[str, Tuple[float, str]]] = {}
+
+    def update(self, job_id: str, job_title: str, result: Dict[str, Any]):
+        rankable = is_rankable(result)
+        if rankable:
+            key = (-combined_score(result), job_id)  # ascending order == best first
+
+        with self._lock:
+            previous = self._entries.pop(job_id, None)
+            if previous is not None:
+                self._by_title[previous[0]].remove(previous[1])
+
+            if rankable:
+                self._by_title.setdefault(job_title, _IndexableSkiplist()).insert(key)
+                self._entries[job_id] = (job_title, key)
+
+    def remove(self, job_id: str):
+        with self._lock:
+            previous = self._entries.pop(job_id, None)
+            if previous is not None:
+                self._by_title[previous[0]].remove(previous[1])
+
+    def on_job_completed(self, job, result: Dict[str, Any]):
+        if job.job_title is not None:
+            self.update(job.job_id, job.job_title, result)
+
+    def on_job_evicted(self, job):
+        self.remove(job.job_id)
+
+    def top(self, job_title: str, n: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            ranked = self._by_title.get(job_title)
+            keys = ranked.head_items(n) if ranked else []
+        return [
+            {"rank": idx + 1, "job_id": job_id, "score": round(-neg_score, 4)}
+            for idx, (neg_score, job_id) in enumerate(keys)
+        ]
+
+    def position(self, job_title: str, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Rank (1 = best) and percentile (share of candidates scoring lower).
+        """
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None or entry[0] != job_title:
+                return None
+
+            ranked = self._by_title[job_title]
+            neg_score = entry[1][0]
+            total = len(ranked)
+            rank = ranked.rank(entry[1]) + 1
+            lower = total - ranked.rank((neg_score, _MAX_ID))
+
+        return {
+            "job_id": job_id,
+            "score": round(-neg_score, 4),
+            "rank": rank,
+            "total": total,
+            "percentile": round(100.0 * lower / total, 2),
+        }
+
+    def titles(self) -> Dict[str, int]:
+        with self._lock:
+            return {title: len(ranked) for title, ranked in self._by_title.items()}
+
+
+class SharedRankingIndex:
+    """
+    Ranking queries for multi-process mode, served from the rank_score
+    column SharedJobManager writes on completion (indexed per job title).
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def on_job_completed(self, job, result: Dict[str, Any]):
+        # Scores are persisted by SharedJobManager itself
+        pass
+
+    def top(self, job_title: str, n: int) -> List[Dict[str, Any]]:
+        return [
+            {"rank": idx + 1, "job_id": job_id, "score": round(score, 4)}
+            for idx, (job_id, score) in enumerate(self.store.top_ranked(job_title, n))
+        ]
+
+    def position(self, job_title: str, job_id: str) -> Optional[Dict[str, Any]]:
+        found = self.store.rank_position(job_title, job_id)
+        if found is None:
+            return None
+
+        score, better, lower, total = found
+        return {
+            "job_id": job_id,
+            "score": round(score, 4),
+            "rank": better + 1,
+            "total": total,
+            "percentile": round(100.0 * lower / total, 2),
+        }
+
+    def titles(self) -> Dict[str, int]:
+        return self.store.ranked_titles()
@@ -0,0 +1,212 @@
+# app/core/scheduler.py
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+
+class Priority:
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+    ALL = (INTERACTIVE, BULK)
+
+
+def parse_tenant_weights(value: str) -> Dict[str, float]:
+    """
+    Parse "tenant=weight,tenant=weight" (the TENANT_WEIGHTS format).
+    """
+    weights = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        tenant, sep, weight = item.partition("=")
+        if not sep or not tenant.strip():
+            raise ValueError(f"Invalid tenant weight {item!r}, expected tenant=weight")
+        weights[tenant.strip()] = float(weight)
+        if weights[tenant.strip()] <= 0:
+            raise ValueError("Tenant weight must be positive")
+    return weights
+
+
+def tenant_weights_from_env() -> Dict[str, float]:
+    """
+    Per-tenant fair-share weights from TENANT_WEIGHTS (e.g. "acme=4,trial=0.5");
+    unlisted tenants weigh 1.0.
+    """
+    return parse_tenant_weights(os.getenv("TENANT_WEIGHTS", ""))
+
+
+class WaitStats:
+    """
+    Rolling queue wait-time samples with percentiles.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._waits: Deque[float] = deque(maxlen=window)
+
+    def record(self, wait: float):
+        self._waits.append(wait)
+
+    def percentile(self, pct: float) -> float:
+        waits = sorted(self._waits)
+        if not waits:
+            return 0.0
+        return waits[min(len(waits) - 1, int(pct / 100 * len(waits)))]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "samples": len(self._waits),
+            "p50": round(self.percentile(50), 3),
+            "p95": round(self.percentile(95), 3),
+            "p99": round(self.percentile(99), 3),
+        }
+
+
+class _ClassQueue:
+    """
+    One priority class: per-tenant FIFOs served by weighted fair queuing.
+    Each tenant advances a virtual clock by 1/weight per dispatched job;
+    the backlogged tenant with the smallest clock goes next.
+
+    Idle tenants are forgotten once the class queue drains (nobody is
+    waiting, so there is no share to balance), and during a busy period
+    once their clock falls behind the class clock (they would rejoin at
+    the class clock anyway). vtime thus does not grow with every tenant
+    ever seen.
+    """
+
+    def __init__(self):
+        self.tenants: Dict[str, Deque[Tuple[float, Any]]] = {}
+        self.vtime: Dict[str, float] = {}
+        self.clock = 0.0
+        self.size = 0
+        self.wait_stats = WaitStats()
+        self._prune_at = 64
+
+    def push(self, tenant: str, item: Any, now: float):
+        queue = self.tenants.get(tenant)
+        if queue is None:
+            queue = self.tenants[tenant] = deque()
+            # Newly backlogged tenants join at the current clock (no saved credit)
+            self.vtime[tenant] = max(self.vtime.get(tenant, 0.0), self.clock)
+        queue.append((now, item))
+        self.size += 1
+
+    def oldest_enqueued_at(self) -> Optional[float]:
+        if not self.size:
+            return None
+        return min(queue[0][0] for queue in self.tenants.values())
+
+    def pop(self, weights: Dict[str, float], now: float) -> Any:
+        tenant = min(self.tenants, key=lambda t: self.vtime[t])
+        queue = self.tenants[tenant]
+        enqueued_at, item = queue.popleft()
+
+        self.clock = self.vtime[tenant]
+        self.vtime[tenant] += 1.0 / weights.get(tenant, 1.0)
+        if not queue:
+            del self.tenants[tenant]
+            if len(self.vtime) >= self._prune_at:
+                self._prune_idle()
+
+        self.size -= 1
+        if not self.size:
+            self.vtime.clear()
+            self.clock = 0.0
+        self.wait_stats.record(now - enqueued_at)
+        return item
+
+    def _prune_idle(self):
+        self.vtime = {
+            tenant: vtime for tenant, vtime in self.vtime.items()
+            if tenant in self.tenants or vtime > self.clock
+        }
+        # Amortized: the next sweep waits until the dict has doubled
+        self._prune_at = max(64, 2 * len(self.vtime))
+
+
+class FairScheduler:
+    """
+    Priority + fair-share job queue.
+
+    - Interactive jobs are served before bulk jobs...
+    - ...unless the oldest bulk job has waited longer than bulk_max_wait
+      seconds (aging). Aged bulk work then gets one of every
+      aged_bulk_interval dispatches, so it never starves completely while
+      interactive traffic keeps most of the capacity.
+    - Within a class, tenants share capacity by weight (default 1.0;
+      weights default to TENANT_WEIGHTS from the environment).
+    """
+
+    def __init__(self, bulk_max_wait: float = 30.0, aged_bulk_interval: int = 4,
+                 weights: Optional[Dict[str, float]] = None):
+        self.bulk_max_wait = bulk_max_wait
+        self.aged_bulk_interval = aged_bulk_interval
+        self._since_bulk = 0
+        self._classes = {priority: _ClassQueue() for priority in Priority.ALL}
+        self._weights: Dict[str, float] = {}
+        self._cond = threading.Condition()
+
+        for tenant, weight in (weights if weights is not None else tenant_weights_from_env()).items():
+            self.set_weight(tenant, weight)
+
+    def set_weight(self, tenant: str, weight: float):
+        if weight <= 0:
+            raise ValueError("Tenant weight must be positive")
+        with self._cond:
+            self._weights[tenant] = weight
+
+    def put(self, item: Any, priority: str = Priority.INTERACTIVE, tenant: str = "default"):
+        if priority not in self._classes:
+            raise ValueError(f"Unknown priority: {priority}")
+        with self._cond:
+            self._classes[priority].push(tenant, item, time.monotonic())
+            self._cond.notify()
+
+    def _next_class(self, now: float) -> Optional[_ClassQueue]:
+        interactive = self._classes[Priority.INTERACTIVE]
+        bulk = self._classes[Priority.BULK]
+
+        if not interactive.size:
+            return bulk if bulk.size else None
+        if not bulk.size:
+            return interactive
+
+        oldest_bulk = bulk.oldest_enqueued_at()
+        aged = now - oldest_bulk >= self.bulk_max_wait
+        if aged and self._since_bulk + 1 >= self.aged_bulk_interval:
+            return bulk
+        return interactive
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Block until a job is available; None on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                queue = self._next_class(now)
+                if queue is not None:
+                    is_bulk = queue is self._classes[Priority.BULK]
+                    self._since_bulk = 0 if is_bulk else self._since_bulk + 1
+                    return queue.pop(self._weights, now)
+
+                remaining = None if deadline is None else deadline - now
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._cond:
+            return {
+                priority: {
+                    "queued": queue.size,
+                    "tenants": len(queue.tenants),
+                    "wait_seconds": queue.wait_stats.snapshot(),
+                }
+                for priority, queue in self._classes.items()
+            }
@@ -0,0 +1,170 @@
+# app/core/tracing.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Append one JSON line per finished job here (e.g. data/traces/traces-{pid}.jsonl);
+# unset disables recording
+TRACE_RECORD_PATH = os.getenv("TRACE_RECORD_PATH")
+
+
+def text_digest(text: str) -> str:
+    """
+    Short content hash used to detect changed stage outputs between runs.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class JobTrace:
+    """
+    Everything needed to replay one job offline: the input documents,
+    digests of the parsed text, every prompt / LLM response, per-stage
+    timings and the final result.
+    """
+
+    def __init__(self, job_id: str, inputs: Dict[str, Any], started_at: Optional[float] = None):
+        self.job_id = job_id
+        self.inputs = inputs
+        self.started_at = started_at if started_at is not None else time.time()
+        self.finished_at: Optional[float] = None
+        self.stages: Dict[str, float] = {}  # stage name → seconds
+        self.digests: Dict[str, str] = {}
+        self.llm_calls: List[Dict[str, Any]] = []
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+
+    def add_stage(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_llm_call(
+        self,
+        stage: str,
+        prompt: str,
+        response: Optional[str],
+        latency: float,
+        error: Optional[str] = None
+    ):
+        self.llm_calls.append({
+            "stage": stage,
+            "prompt": prompt,
+            "prompt_digest": text_digest(prompt),
+            "response": response,
+            "latency": latency,
+            "error": error,
+        })
+        self.add_stage(f"{stage}.llm", latency)
+
+    def finish(self, result: Optional[Dict] = None, error: Optional[str] = None):
+        self.finished_at = time.time()
+        self.result = result
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "inputs": self.inputs,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "stages": self.stages,
+            "digests": self.digests,
+            "llm_calls": self.llm_calls,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobTrace":
+        trace = cls(data["job_id"], data["inputs"], data["started_at"])
+        trace.finished_at = data.get("finished_at")
+        trace.stages = data.get("stages", {})
+        trace.digests = data.get("digests", {})
+        trace.llm_calls = data.get("llm_calls", [])
+        trace.result = data.get("result")
+        trace.error = data.get("error")
+        return trace
+
+
+# The trace of the job running on the current worker thread
+_local = threading.local()
+
+
+def current_trace() -> Optional[JobTrace]:
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def recording(trace: Optional[JobTrace]) -> Iterator[Optional[JobTrace]]:
+    """
+    Make trace the current thread's trace (None records nothing).
+    """
+    previous = current_trace()
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    """
+    Add the wall time of the block to the current trace, if any.
+    """
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_stage(name, time.perf_counter() - start)
+
+
+def record_digest(name: str, text: str):
+    trace = current_trace()
+    if trace is not None:
+        trace.digests[name] = text_digest(text)
+
+
+class TraceRecorder:
+    """
+    Appends finished job traces to a JSONL file.
+    A "{pid}" in the path gives every worker process its own file.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path.format(pid=os.getpid()))
+        self._lock = threading.Lock()
+
+    def record(self, trace: JobTrace):
+        line = json.dumps(trace.to_dict())
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def default_recorder() -> Optional[TraceRecorder]:
+    """
+    Recorder configured by TRACE_RECORD_PATH, or None when recording is off.
+    """
+    if not TRACE_RECORD_PATH:
+        return None
+    return TraceRecorder(TRACE_RECORD_PATH)
+
+
+def load_traces(path: str) -> List[JobTrace]:
+    traces = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                traces.append(JobTrace.from_dict(json.loads(line)))
+    return traces
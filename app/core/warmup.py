@@ -0,0 +1,96 @@
+# app/core/warmup.py
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.ai.llm_client import get_client, get_model_router
+from app.config import load_env
+from app.rag.prompt_templates import get_prompt_templates
+from app.rag.retriever import get_global_retriever
+from app.utils import pdf_reader
+
+
+class NotConfigured(Exception):
+    """
+    Raised by a warm-up step whose component is switched off by configuration.
+    """
+
+
+class Readiness:
+    """
+    Tracks which lazily initialized components are warm.
+    Liveness never depends on this; readiness requires every component
+    except those reported as "not_configured".
+    """
+
+    COMPONENTS = ("pdf_reader", "prompt_templates", "retriever", "llm_client")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Dict[str, str] = {name: "pending" for name in self.COMPONENTS}
+        self._errors: Dict[str, str] = {}
+
+    def mark(self, component: str, ok: bool, error: Optional[str] = None):
+        with self._lock:
+            self._state[component] = "ready" if ok else "failed"
+            if error:
+                self._errors[component] = error
+            else:
+                self._errors.pop(component, None)
+
+    def mark_not_configured(self, component: str, reason: str):
+        with self._lock:
+            self._state[component] = "not_configured"
+            self._errors[component] = reason
+
+    def is_ready(self) -> bool:
+        with self._lock:
+            return all(state in ("ready", "not_configured") for state in self._state.values())
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"components": dict(self._state), "errors": dict(self._errors)}
+
+
+readiness = Readiness()
+
+
+def _warm_llm_client():
+    load_env()
+    if not os.getenv("OPENROUTER_API_KEY"):
+        raise NotConfigured("OPENROUTER_API_KEY is not set")
+    get_client()
+    get_model_router()
+
+
+WARM_UP_STEPS: List[Tuple[str, Callable[[], object]]] = [
+    ("pdf_reader", pdf_reader.warm_up),
+    ("prompt_templates", get_prompt_templates),
+    ("retriever", get_global_retriever),
+    ("llm_client", _warm_llm_client),
+]
+
+
+def warm_up():
+    """
+    Import heavy dependencies and build shared providers ahead of the
+    first job. Failures are recorded, not raised: the first real use
+    retries the lazy initializer.
+    """
+    for component, step in WARM_UP_STEPS:
+        try:
+            step()
+            readiness.mark(component, True)
+        except NotConfigured as e:
+            readiness.mark_not_configured(component, str(e))
+            print(f"⚠️ {component} not configured: {e}")
+        except Exception as e:
+            readiness.mark(component, False, str(e))
+            print(f"⚠️ Warm-up failed for {component}: {e}")
+
+
+def start_warm_up() -> threading.Thread:
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
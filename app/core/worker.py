@@ -1,71 +1,411 @@
 # app/core/worker.py
 
+import os
+import socket
 import threading
-from typing import Callable, Dict, Any
+import time
+from typing import Callable, Dict, Any, List, Optional
 
-from app.core.job_manager import JobManager
-from app.utils.pdf_reader import extract_text_from_pdf
+from app.ai.limiter import LLM_CONCURRENCY_MAX
+from app.core.job_manager import BaseJobManager, SharedJobManager
+from app.core.scheduler import FairScheduler, Priority
+from app.core.tracing import (
+    JobTrace,
+    TraceRecorder,
+    default_recorder,
+    recording,
+    record_digest,
+    timed_stage
+)
+from app.storage.jobs_store import CheckpointStore, StageCheckpoint, SharedJobStore
+from app.utils.pdf_reader import extract_text_from_pdf, file_fingerprint, PageTextCache
+
+# CVs beyond a few pages add parsing/LLM cost but no scoring signal
+CV_MAX_PAGES = 5
+CV_MAX_CHARS = 20000
+
+# Project reports may be long; cap only the amount of text sent downstream
+PROJECT_MAX_PAGES = None
+PROJECT_MAX_CHARS = 60000
+
+DEFAULT_JOB_TITLE = "Backend Developer"
+
+# Jobs mostly wait on the LLM: size the pool so the adaptive LLM limiter,
+# not the thread count, decides how many calls are in flight
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", str(LLM_CONCURRENCY_MAX)))
+
+# Stage checkpoints of worker processes; default: worker_checkpoints.db next
+# to the shared DB. Shared by all workers of a queue, so a job reclaimed
+# after a lost lease resumes from the previous owner's last stage.
+WORKER_CHECKPOINT_DB = os.getenv("WORKER_CHECKPOINT_DB")
 
 
 class AsyncWorker:
     """
-    Fake async worker using background thread.
+    Fake async worker using a fixed pool of background threads.
     Updated for 3-stage evaluation pipeline.
+
+    Jobs go through a FairScheduler (priority classes + per-tenant fair
+    share), so a bulk upload cannot starve interactive evaluations.
+
+    Every job spec and completed stage is checkpointed to a CheckpointStore;
+    recover() re-enqueues jobs interrupted by a crash or restart.
+
+    With a TraceRecorder (TRACE_RECORD_PATH), every finished job is written
+    out as a JobTrace for offline replay (scripts/replay_traffic.py).
     """
 
-    def __init__(self, job_manager: JobManager):
+    def __init__(
+        self,
+        job_manager: BaseJobManager,
+        page_cache: PageTextCache = None,
+        scheduler: FairScheduler = None,
+        concurrency: int = WORKER_CONCURRENCY,
+        checkpoint_store: CheckpointStore = None,
+        trace_recorder: TraceRecorder = None
+    ):
         self.job_manager = job_manager
+        self.page_cache = page_cache or PageTextCache()
+        self.scheduler = scheduler or FairScheduler()
+        self.checkpoint_store = checkpoint_store or CheckpointStore()
+        self.trace_recorder = trace_recorder or default_recorder()
+        self.concurrency = concurrency
+
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._threads:
+                return
+            for idx in range(self.concurrency):
+                thread = threading.Thread(
+                    target=self._loop,
+                    name=f"eval-worker-{idx}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _loop(self):
+        while True:
+            args = self.scheduler.get()
+            self._execute(*args)
 
     def run_job(
         self,
         job_id: str,
         cv_pdf_path: str,
         project_pdf_path: str,  # CHANGED: job_pdf_path → project_pdf_path
-        task_fn: Callable[[str, str, str], Dict[str, Any]],  # CHANGED: takes 3 params
+        task_fn: Callable[..., Dict[str, Any]],  # (cv_text, project_text, job_title, checkpoint=)
+        job_title: str = DEFAULT_JOB_TITLE,
+        priority: str = Priority.INTERACTIVE,
+        tenant: str = "default",
     ):
         """
-        Start background job for evaluation.
+        Queue background job for evaluation.
         
         Args:
             job_id: Unique job identifier
             cv_pdf_path: Path to candidate CV PDF
             project_pdf_path: Path to project report PDF (not job description)
-            task_fn: Function that takes (cv_text, project_text, job_title) → result dict
+            task_fn: Function that takes (cv_text, project_text, job_title,
+                checkpoint=StageCheckpoint) → result dict
+            job_title: Role the candidate is evaluated for
+            priority: Priority.INTERACTIVE or Priority.BULK
+            tenant: Caller key used for fair sharing between recruiters
         """
-        thread = threading.Thread(
-            target=self._execute,
-            args=(job_id, cv_pdf_path, project_pdf_path, task_fn),
-            daemon=True
+        self.checkpoint_store.save_job(job_id, {
+            "cv_pdf_path": cv_pdf_path,
+            "project_pdf_path": project_pdf_path,
+            "job_title": job_title,
+            "priority": priority,
+            "tenant": tenant,
+        })
+
+        self._ensure_started()
+        self.scheduler.put(
+            (job_id, cv_pdf_path, project_pdf_path, task_fn, job_title),
+            priority=priority,
+            tenant=tenant
         )
-        thread.start()
+
+    def recover(self, task_fn: Callable[..., Dict[str, Any]]) -> int:
+        """
+        Re-enqueue jobs left unfinished by a previous process.
+        They resume from their last checkpointed stage.
+        Returns the number of recovered jobs.
+        """
+        pending = self.checkpoint_store.pending_jobs()
+        if not pending:
+            return 0
+
+        self._ensure_started()
+        for job_id, spec in pending:
+            self.job_manager.restore_job(job_id, spec["job_title"])
+            self.scheduler.put(
+                (job_id, spec["cv_pdf_path"], spec["project_pdf_path"], task_fn, spec["job_title"]),
+                priority=spec.get("priority", Priority.INTERACTIVE),
+                tenant=spec.get("tenant", "default")
+            )
+
+        print(f"♻️ Recovered {len(pending)} interrupted job(s)")
+        return len(pending)
+
+    def queue_stats(self) -> Dict[str, Dict]:
+        """
+        Queue depth and wait-time percentiles per priority class.
+        """
+        return self.scheduler.stats()
+
+    def _new_trace(
+        self,
+        job_id: str,
+        cv_pdf_path: str,
+        project_pdf_path: str,
+        job_title: str
+    ) -> Optional[JobTrace]:
+        if self.trace_recorder is None:
+            return None
+
+        inputs = {
+            "cv_pdf_path": cv_pdf_path,
+            "project_pdf_path": project_pdf_path,
+            "job_title": job_title,
+        }
+        for name, path in (("cv", cv_pdf_path), ("project", project_pdf_path)):
+            try:
+                inputs[f"{name}_fingerprint"] = file_fingerprint(path)
+            except OSError:
+                inputs[f"{name}_fingerprint"] = None
+        return JobTrace(job_id, inputs)
+
+    def _holds_job(self, job_id: str) -> bool:
+        """
+        Whether this worker may still write the job's outcome.
+        In-process jobs are never handed to another worker.
+        """
+        return True
 
     def _execute(
         self,
         job_id: str,
         cv_pdf_path: str,
         project_pdf_path: str,  # CHANGED: job_pdf_path → project_pdf_path
-        task_fn: Callable[[str, str, str], Dict[str, Any]],  # CHANGED: takes 3 params
+        task_fn: Callable[..., Dict[str, Any]],
+        job_title: str = DEFAULT_JOB_TITLE,
     ):
         """
         Execute the evaluation pipeline in background.
         """
-        try:
-            self.job_manager.set_processing(job_id)
+        trace = self._new_trace(job_id, cv_pdf_path, project_pdf_path, job_title)
+        result, error = None, None
+        holds_job = True
+
+        with recording(trace):
+            try:
+                self.job_manager.set_processing(job_id)
+                checkpoint = StageCheckpoint(self.checkpoint_store, job_id)
+
+                # Read PDFs (checkpointed: a resumed job skips parsing)
+                with timed_stage("parse_cv"):
+                    cv_text = checkpoint.run("cv_text", lambda: extract_text_from_pdf(
+                        cv_pdf_path,
+                        max_pages=CV_MAX_PAGES,
+                        max_chars=CV_MAX_CHARS,
+                        cache=self.page_cache
+                    ))
+                with timed_stage("parse_project"):
+                    project_text = checkpoint.run("project_text", lambda: extract_text_from_pdf(
+                        project_pdf_path,
+                        max_pages=PROJECT_MAX_PAGES,
+                        max_chars=PROJECT_MAX_CHARS,
+                        cache=self.page_cache
+                    ))
+                record_digest("cv_text", cv_text)
+                record_digest("project_text", project_text)
+
+                # Run 3-stage evaluation pipeline
+                # task_fn expects: (cv_text, project_text, job_title, checkpoint=...)
+                result = task_fn(cv_text, project_text, job_title, checkpoint=checkpoint)
+
+                holds_job = self._holds_job(job_id)
+                if holds_job:
+                    self.job_manager.set_completed(job_id, result)
+
+            except Exception as e:
+                error = str(e)
+                holds_job = self._holds_job(job_id)
+                if holds_job:
+                    self.job_manager.set_failed(job_id, error)
+                # Log the error for debugging
+                print(f"❌ Job {job_id} failed: {e}")
 
-            # Read PDFs
-            cv_text = extract_text_from_pdf(cv_pdf_path)
-            project_text = extract_text_from_pdf(project_pdf_path)  # CHANGED
+        # Finished either way; failed jobs are not retried on restart.
+        # After a lost claim the checkpoints belong to the new owner.
+        if holds_job:
+            self.checkpoint_store.finish_job(job_id)
 
-            # Default job title (can be extended to pass as parameter)
-            job_title = "Backend Developer"
-            
-            # Run 3-stage evaluation pipeline
-            # task_fn now expects: (cv_text, project_text, job_title)
-            result = task_fn(cv_text, project_text, job_title)
+        if trace is not None:
+            trace.finish(result=result, error=error)
+            try:
+                self.trace_recorder.record(trace)
+            except OSError as e:
+                print(f"⚠️ Could not record trace for job {job_id}: {e}")
 
-            self.job_manager.set_completed(job_id, result)
 
-        except Exception as e:
-            self.job_manager.set_failed(job_id, str(e))
-            # Log the error for debugging
-            print(f"❌ Job {job_id} failed: {e}")
+class SharedQueueDispatcher:
+    """
+    API-side replacement for AsyncWorker in multi-process mode.
+    run_job only enqueues into the SharedJobStore; separate worker
+    processes (scripts/run_workers.py) claim and execute the jobs.
+    """
+
+    def __init__(self, store: SharedJobStore):
+        self.store = store
+
+    def run_job(
+        self,
+        job_id: str,
+        cv_pdf_path: str,
+        project_pdf_path: str,
+        task_fn: Callable[..., Dict[str, Any]],
+        job_title: str = DEFAULT_JOB_TITLE,
+        priority: str = Priority.INTERACTIVE,
+        tenant: str = "default",
+    ):
+        """
+        Enqueue job for a worker process.
+        task_fn is ignored: functions cannot cross process boundaries, the
+        worker process is started with its own task_fn.
+        """
+        self.store.enqueue(
+            job_id,
+            {
+                "cv_pdf_path": cv_pdf_path,
+                "project_pdf_path": project_pdf_path,
+                "job_title": job_title,
+            },
+            priority=priority,
+            tenant=tenant
+        )
+
+    def recover(self, task_fn: Callable[..., Dict[str, Any]]) -> int:
+        # Queue rows are durable; workers reclaim expired leases themselves
+        return 0
+
+    def queue_stats(self) -> Dict[str, Dict]:
+        return self.store.queue_stats()
+
+
+class ProcessWorker(AsyncWorker):
+    """
+    Worker loop for a dedicated worker process.
+    Claims jobs from the shared SQLite queue instead of the in-process
+    scheduler; each process runs `concurrency` threads.
+
+    A heartbeat thread renews the lease of every running job, and a job's
+    outcome is only written (and acked) while this worker still holds its
+    claim. Idle threads poll with exponential backoff up to max_poll_interval.
+    Stage checkpoints live in WORKER_CHECKPOINT_DB (see above), never in the
+    CHECKPOINT_DB of a single-process API.
+    """
+
+    def __init__(
+        self,
+        store: SharedJobStore,
+        task_fn: Callable[..., Dict[str, Any]],
+        concurrency: int = WORKER_CONCURRENCY,
+        poll_interval: float = 0.2,
+        page_cache: PageTextCache = None,
+        checkpoint_store: CheckpointStore = None,
+        max_poll_interval: float = 1.0
+    ):
+        if checkpoint_store is None:
+            checkpoint_store = CheckpointStore(
+                WORKER_CHECKPOINT_DB
+                or os.path.join(os.path.dirname(store.db_path), "worker_checkpoints.db")
+            )
+        super().__init__(
+            SharedJobManager(store),
+            page_cache=page_cache,
+            concurrency=concurrency,
+            checkpoint_store=checkpoint_store
+        )
+        self.store = store
+        self.task_fn = task_fn
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(poll_interval, max_poll_interval)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        # Claims held by this process: job_id → claim token
+        self._claims: Dict[str, str] = {}
+        self._claims_lock = threading.Lock()
+
+    def _holds_job(self, job_id: str) -> bool:
+        with self._claims_lock:
+            token = self._claims.get(job_id)
+        if token is not None and self.store.renew(job_id, token):
+            return True
+        print(f"⚠️ Lease on job {job_id} was lost; discarding this run's outcome")
+        return False
+
+    def _heartbeat(self):
+        """
+        Renew the leases of running jobs well before they expire, so a
+        slow job (LLM queueing, failover, hedging) is never reclaimed.
+        """
+        interval = self.store.lease_seconds / 4
+        while True:
+            time.sleep(interval)
+            with self._claims_lock:
+                claims = list(self._claims.items())
+            for job_id, token in claims:
+                try:
+                    if not self.store.renew(job_id, token):
+                        print(f"⚠️ Lease on job {job_id} was lost")
+                except Exception as e:
+                    print(f"⚠️ Lease renewal failed for job {job_id}: {e}")
+
+    def _loop(self):
+        claimer = f"{self.worker_id}:{threading.current_thread().name}"
+        idle_sleep = self.poll_interval
+        while True:
+            try:
+                claimed = self.store.claim(claimer)
+            except Exception as e:
+                print(f"⚠️ Queue claim failed ({claimer}): {e}")
+                claimed = None
+
+            if claimed is None:
+                # Back off while the queue stays empty
+                time.sleep(idle_sleep)
+                idle_sleep = min(idle_sleep * 2, self.max_poll_interval)
+                continue
+            idle_sleep = self.poll_interval
+
+            job_id, spec, token = claimed
+            with self._claims_lock:
+                self._claims[job_id] = token
+            try:
+                self.job_manager.restore_job(job_id, spec["job_title"])
+                self._execute(
+                    job_id,
+                    spec["cv_pdf_path"],
+                    spec["project_pdf_path"],
+                    self.task_fn,
+                    spec["job_title"]
+                )
+                self.store.ack(job_id, token)
+            finally:
+                with self._claims_lock:
+                    self._claims.pop(job_id, None)
+
+    def serve_forever(self):
+        """
+        Start the worker threads and block.
+        """
+        threading.Thread(target=self._heartbeat, name="lease-heartbeat", daemon=True).start()
+        self._ensure_started()
+        for thread in self._threads:
+            thread.join()
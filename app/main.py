@@ -1,22 +1,63 @@
 # app/main.py
 
+from contextlib import asynccontextmanager
+
+from app.config import load_env
+
+# Configuration must be in os.environ before routers read it at import
+load_env()
+
 from fastapi import FastAPI
-from app.api.jobs import router as jobs_router
+from fastapi.responses import JSONResponse
+from app.api.jobs import router as jobs_router, recover_interrupted_jobs
+from app.api.llm import router as llm_router
+from app.api.rankings import router as rankings_router
+from app.core.warmup import readiness, start_warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy imports (LLM SDK, PDF parser) and the internal-docs index are
+    # prepared in the background; /health answers immediately
+    start_warm_up()
+
+    # Resume jobs that were in flight when the previous process died
+    recover_interrupted_jobs()
+    yield
+
 
 app = FastAPI(
     title="AI CV Screening Backend",
     description="Async job-based CV screening system with RAG architecture",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Register API routers
 app.include_router(jobs_router)
+app.include_router(rankings_router)
+app.include_router(llm_router)
 
 
 @app.get("/health")
+@app.get("/health/live")
 def health_check():
     """
-    Simple health check endpoint.
+    Simple health check endpoint (liveness).
     Used for monitoring & deployment validation.
     """
     return {"status": "ok"}
+
+
+@app.get("/health/ready")
+def readiness_check():
+    """
+    Readiness: 200 once the index, PDF parser and LLM client are warm,
+    503 while warming up (or if a component failed to initialize).
+    An LLM client without OPENROUTER_API_KEY is reported as
+    "not_configured" and does not hold readiness back.
+    """
+    body = readiness.snapshot()
+    if readiness.is_ready():
+        return {"status": "ready", **body}
+    return JSONResponse(status_code=503, content={"status": "not_ready", **body})
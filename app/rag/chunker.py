@@ -1,6 +1,64 @@
 # app/rag/chunker.py
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
+
+
+def _line_pieces(line: str, chunk_size: int) -> Iterator[str]:
+    """
+    Split a line longer than chunk_size at word boundaries, and words
+    longer than chunk_size by characters, so no text is dropped.
+    """
+    if len(line) <= chunk_size:
+        yield line
+        return
+
+    piece = ""
+    for word in line.split():
+        while len(word) > chunk_size:
+            if piece:
+                yield piece
+                piece = ""
+            yield word[:chunk_size]
+            word = word[chunk_size:]
+        if piece and len(piece) + 1 + len(word) > chunk_size:
+            yield piece
+            piece = ""
+        piece = f"{piece} {word}" if piece else word
+    if piece:
+        yield piece
+
+
+def _iter_chunk_texts(lines: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """
+    Pack lines into chunks of at most chunk_size characters (plus separators).
+    Empty chunks are never produced.
+    """
+    current = ""
+
+    for line in lines:
+        for piece in _line_pieces(line, chunk_size):
+            if current.strip() and len(current) + len(piece) > chunk_size:
+                yield current.strip()
+                current = ""
+            current += piece + " "
+
+    if current.strip():
+        yield current.strip()
+
+
+def iter_chunks(
+    lines: Iterable[str],
+    source: str,
+    doc_type: str = "general",
+    chunk_size: int = 300
+) -> Iterator[str]:
+    """
+    Streaming chunker over an iterable of lines.
+    Yields each chunk as soon as it is complete.
+    """
+    for chunk in _iter_chunk_texts(lines, chunk_size):
+        # Add chunk with metadata tags
+        yield f"[{source}|{doc_type}] {chunk}"
 
 
 def chunk_text(
@@ -13,22 +71,7 @@ def chunk_text(
     Enhanced text chunking with metadata tracking.
     Returns chunks with embedded metadata tags.
     """
-    chunks = []
-    current = ""
-    
-    for line in text.splitlines():
-        if len(current) + len(line) > chunk_size:
-            # Add chunk with metadata tags
-            chunk_with_meta = f"[{source}|{doc_type}] {current.strip()}"
-            chunks.append(chunk_with_meta)
-            current = ""
-        current += line + " "
-    
-    if current.strip():
-        chunk_with_meta = f"[{source}|{doc_type}] {current.strip()}"
-        chunks.append(chunk_with_meta)
-    
-    return chunks
+    return list(iter_chunks(text.splitlines(), source, doc_type, chunk_size))
 
 
 def chunk_text_with_metadata(
@@ -40,17 +83,7 @@ def chunk_text_with_metadata(
     Alternative: Return chunks with separate metadata.
     Returns list of {"text": chunk_text, "metadata": metadata}
     """
-    chunks_text = []
-    current = ""
-    
-    for line in text.splitlines():
-        if len(current) + len(line) > chunk_size:
-            chunks_text.append(current.strip())
-            current = ""
-        current += line + " "
-    
-    if current.strip():
-        chunks_text.append(current.strip())
+    chunks_text = list(_iter_chunk_texts(text.splitlines(), chunk_size))
     
     # Return chunks with metadata
     return [{"text": chunk, "metadata": metadata} for chunk in chunks_text]
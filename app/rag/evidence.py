@@ -0,0 +1,136 @@
+# app/rag/evidence.py
+
+import math
+from typing import Dict, List, Optional
+
+from app.rag.chunker import chunk_text_with_metadata
+from app.rag.vector_db import SimpleVectorDB
+
+# One retrieval query per rubric parameter (see prompts/*_prompt.txt)
+CV_EVIDENCE_QUERIES: Dict[str, str] = {
+    "technical_skills": "backend python java node go database sql postgresql mysql mongodb redis "
+                        "api rest graphql cloud aws gcp azure docker kubernetes llm ai ml rag",
+    "experience": "years experience senior junior engineer developer worked role company "
+                  "responsible project team lead",
+    "achievements": "improved reduced increased built launched delivered scaled optimized "
+                    "performance users impact award revenue",
+    "cultural_fit": "team collaboration communication mentoring learning leadership agile "
+                    "ownership initiative",
+}
+
+PROJECT_EVIDENCE_QUERIES: Dict[str, str] = {
+    "correctness": "requirements prompt chaining rag retrieval llm evaluation pipeline api "
+                   "endpoint job result",
+    "code_quality": "modular clean structure tests testing architecture design pattern "
+                    "separation",
+    "resilience": "error handling retry retries timeout failure fallback exception validation "
+                  "backoff",
+    "documentation": "readme documentation setup instructions trade offs assumptions "
+                     "limitations explanation",
+    "creativity": "bonus authentication deployment docker dashboard monitoring extra "
+                  "improvement",
+}
+
+CV_EVIDENCE_MAX_CHARS = 6000
+PROJECT_EVIDENCE_MAX_CHARS = 8000
+
+# A pack carrying less excerpt text than this share of the budget means
+# retrieval found little; a truncated copy of the document is more faithful
+MIN_PACK_FILL = 0.25
+
+# Candidates fetched per parameter, as a multiple of per_parameter
+CANDIDATE_DEPTH = 3
+
+# Room kept for the pack header line
+HEADER_RESERVE = 160
+
+
+def _excerpt(idx: int, total: int, parameters: List[str], text: str) -> str:
+    label = f" (relevant to: {', '.join(parameters)})" if parameters else ""
+    return f"[Excerpt {idx + 1}/{total}{label}]\n{text}"
+
+
+def build_evidence_pack(
+    text: str,
+    queries: Dict[str, str],
+    max_chars: int,
+    per_parameter: Optional[int] = None,
+    chunk_size: int = 300
+) -> str:
+    """
+    Replace a long candidate document with the excerpts most relevant to
+    each rubric parameter, within a max_chars budget.
+
+    Documents already within budget are returned unchanged. The per-job
+    index is local to this call and freed as soon as the pack is built.
+    per_parameter defaults to an even split of the budget across parameters;
+    parameters take turns, so each gets evidence before the budget runs out.
+
+    The whole pack (header, labels and excerpts) fits in max_chars. If
+    retrieval fills too little of the budget, the document is truncated
+    to max_chars instead.
+    """
+    if len(text) <= max_chars:
+        return text
+
+    if per_parameter is None:
+        per_parameter = max(1, math.ceil(max_chars / chunk_size / len(queries)))
+
+    chunks = [c["text"] for c in chunk_text_with_metadata(text, {}, chunk_size)]
+    if not chunks:
+        return text[:max_chars]
+
+    index = SimpleVectorDB()
+    index.add_documents(chunks)  # single tokenization pass
+
+    # Parameters often rank the same chunks; search deeper so overlaps
+    # still leave enough distinct candidates to fill the budget
+    ranked: Dict[str, List[int]] = {
+        parameter: [
+            idx for score, idx in index.scored_search(query, per_parameter * CANDIDATE_DEPTH)
+            if score > 0
+        ]
+        for parameter, query in queries.items()
+    }
+
+    budget = max_chars - HEADER_RESERVE
+
+    # The opening chunk usually carries the summary / overview
+    selected: Dict[int, List[str]] = {0: []}
+    used = len(_excerpt(0, len(chunks), [], chunks[0])) + 2
+
+    # Round-robin over parameters until the budget is spent
+    for rank in range(per_parameter * CANDIDATE_DEPTH):
+        for parameter, indices in ranked.items():
+            if rank >= len(indices):
+                continue
+            idx = indices[rank]
+            if idx in selected:
+                selected[idx].append(parameter)
+                used += len(parameter) + 2
+                continue
+            cost = len(_excerpt(idx, len(chunks), [parameter], chunks[idx])) + 2
+            if used + cost > budget:
+                continue
+            selected[idx] = [parameter]
+            used += cost
+
+    if sum(len(chunks[idx]) for idx in selected) < MIN_PACK_FILL * max_chars:
+        return text[:max_chars]
+
+    # Overview first, then grouped by the first parameter each excerpt serves
+    order = {parameter: pos for pos, parameter in enumerate(queries)}
+    ordered = sorted(
+        selected,
+        key=lambda idx: (order[selected[idx][0]] if selected[idx] else -1, idx)
+    )
+    excerpts = [_excerpt(idx, len(chunks), selected[idx], chunks[idx]) for idx in ordered]
+
+    header = (
+        f"Evidence pack: {len(selected)} of {len(chunks)} excerpts selected from a "
+        f"{len(text)}-character document, ordered by rubric parameter."
+    )
+    pack = header + "\n\n" + "\n\n".join(excerpts)
+
+    # Labels of shared excerpts can overshoot the estimate; cut the last excerpt
+    return pack[:max_chars]
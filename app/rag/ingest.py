@@ -0,0 +1,53 @@
+# app/rag/ingest.py
+
+import os
+from collections import Counter
+from typing import Dict, List
+
+from app.rag.chunker import chunk_text
+from app.rag.vector_db import SimpleVectorDB
+
+INTERNAL_DOCS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "internal_docs"
+)
+
+INTERNAL_DOCS: List[Dict[str, str]] = [
+    {"filename": "job_description.txt", "doc_type": "job_description", "source": "internal"},
+    {"filename": "case_study_brief.txt", "doc_type": "case_study", "source": "internal"},
+    {"filename": "cv_scoring_rubric.txt", "doc_type": "cv_rubric", "source": "internal"},
+    {"filename": "project_scoring_rubric.txt", "doc_type": "project_rubric", "source": "internal"},
+]
+
+
+def ingest_internal_docs(vector_db: SimpleVectorDB, internal_dir: str = INTERNAL_DOCS_DIR) -> Dict[str, int]:
+    """
+    Chunk the internal reference documents into vector_db.
+    Missing files are skipped. Returns chunk counts per doc_type.
+    """
+    all_chunks = []
+    all_metadatas = []
+
+    for doc_info in INTERNAL_DOCS:
+        filepath = os.path.join(internal_dir, doc_info["filename"])
+        if not os.path.exists(filepath):
+            continue
+
+        with open(filepath, "r", encoding="utf-8") as f:
+            text = f.read()
+
+        chunks = chunk_text(text, source=doc_info["source"], doc_type=doc_info["doc_type"])
+        all_chunks.extend(chunks)
+        all_metadatas.extend(
+            {
+                "doc_type": doc_info["doc_type"],
+                "source": doc_info["source"],
+                "filename": doc_info["filename"]
+            }
+            for _ in chunks
+        )
+
+    if all_chunks:
+        vector_db.add_documents(all_chunks, all_metadatas)
+
+    return dict(Counter(m["doc_type"] for m in all_metadatas))
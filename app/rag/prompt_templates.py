@@ -0,0 +1,203 @@
+# app/rag/prompt_templates.py
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Hashable
+
+PROMPTS_DIR = Path(__file__).resolve().parents[2] / "prompts"
+
+PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# Placeholders with this prefix carry per-candidate data.
+# Everything before the first of them is the static (cacheable) prefix.
+CANDIDATE_PREFIX = "CANDIDATE_"
+
+
+class PromptTemplate:
+    """
+    Template pre-split into literal text and {{FIELD}} segments.
+    Split once at load time into a static prefix and a candidate suffix.
+    """
+
+    def __init__(self, name: str, text: str, generation: int = 1):
+        self.name = name
+        self.generation = generation
+        segments = self._parse(text.strip())
+
+        split_at = len(segments)
+        for idx, (is_field, value) in enumerate(segments):
+            if is_field and value.startswith(CANDIDATE_PREFIX):
+                split_at = idx
+                break
+
+        self.prefix_segments = segments[:split_at]
+        self.suffix_segments = segments[split_at:]
+
+    @staticmethod
+    def _parse(text: str) -> List[Tuple[bool, str]]:
+        segments = []
+        pos = 0
+        for match in PLACEHOLDER_RE.finditer(text):
+            if match.start() > pos:
+                segments.append((False, text[pos:match.start()]))
+            segments.append((True, match.group(1)))
+            pos = match.end()
+        if pos < len(text):
+            segments.append((False, text[pos:]))
+        return segments
+
+    def _render(self, segments: List[Tuple[bool, str]], values: Dict[str, str]) -> str:
+        parts = []
+        for is_field, value in segments:
+            if not is_field:
+                parts.append(value)
+            elif value in values:
+                parts.append(str(values[value]))
+            else:
+                raise KeyError(f"Missing value for {{{{{value}}}}} in template '{self.name}'")
+        return "".join(parts)
+
+    def render_prefix(self, values: Dict[str, str]) -> str:
+        return self._render(self.prefix_segments, values)
+
+    def render_suffix(self, values: Dict[str, str]) -> str:
+        return self._render(self.suffix_segments, values)
+
+
+class PromptTemplateEngine:
+    """
+    Loads templates from prompts/ once and caches rendered static prefixes.
+
+    Prompts are built as <cached static prefix> + <candidate suffix>, so the
+    leading tokens are byte-identical across candidates and provider-side
+    prefix caching can hit. Template files are hot-reloaded when their mtime
+    changes (checked at most every reload_interval seconds).
+    """
+
+    def __init__(
+        self,
+        prompts_dir: Path = PROMPTS_DIR,
+        reload_interval: float = 1.0,
+        max_cached_prefixes: int = 256
+    ):
+        self.prompts_dir = Path(prompts_dir)
+        self.reload_interval = reload_interval
+        self.max_cached_prefixes = max_cached_prefixes
+
+        self._lock = threading.Lock()
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._prefix_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._last_check = 0.0
+
+        self.reload()
+
+    def reload(self):
+        """
+        (Re)load every *.txt template whose file changed since the last load,
+        and forget templates whose file is gone.
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            paths = list(self.prompts_dir.glob("*.txt")) if self.prompts_dir.is_dir() else []
+
+            # Templates whose file was deleted are dropped with their prefixes
+            names = {path.stem for path in paths}
+            for name in [n for n in self._templates if n not in names]:
+                del self._templates[name]
+                del self._mtimes[name]
+                self._drop_prefixes_locked(name)
+
+            for path in paths:
+                name = path.stem
+                mtime = path.stat().st_mtime
+                if self._mtimes.get(name) == mtime:
+                    continue
+
+                previous = self._templates.get(name)
+                generation = previous.generation + 1 if previous else 1
+                self._templates[name] = PromptTemplate(
+                    name, path.read_text(encoding="utf-8"), generation
+                )
+                self._mtimes[name] = mtime
+
+                # Drop prefixes rendered from the previous version
+                self._drop_prefixes_locked(name)
+
+    def _drop_prefixes_locked(self, name: str):
+        for key in [k for k in self._prefix_cache if k[0] == name]:
+            del self._prefix_cache[key]
+
+    def _maybe_reload(self):
+        if time.monotonic() - self._last_check >= self.reload_interval:
+            self.reload()
+
+    def get(self, name: str) -> PromptTemplate:
+        self._maybe_reload()
+        template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"Prompt template '{name}' not found in {self.prompts_dir}")
+        return template
+
+    def get_prefix(
+        self,
+        template: PromptTemplate,
+        cache_key: Hashable,
+        static_values: Dict[str, str]
+    ) -> str:
+        """
+        Rendered static prefix, cached per (template, template generation, cache_key).
+        """
+        key = (template.name, template.generation, cache_key)
+
+        with self._lock:
+            prefix = self._prefix_cache.get(key)
+            if prefix is not None:
+                self._prefix_cache.move_to_end(key)
+                return prefix
+
+        prefix = template.render_prefix(static_values)
+
+        with self._lock:
+            self._prefix_cache[key] = prefix
+            if len(self._prefix_cache) > self.max_cached_prefixes:
+                self._prefix_cache.popitem(last=False)
+
+        return prefix
+
+    def render(
+        self,
+        name: str,
+        static_values: Dict[str, str],
+        candidate_values: Dict[str, str],
+        cache_key: Optional[Hashable] = None
+    ) -> str:
+        """
+        Build the full prompt as cached prefix + candidate suffix.
+        Without an explicit cache_key, the static values themselves are the key.
+        """
+        if cache_key is None:
+            cache_key = tuple(sorted(static_values.items()))
+
+        template = self.get(name)
+        prefix = self.get_prefix(template, cache_key, static_values)
+        return prefix + template.render_suffix(candidate_values)
+
+
+_engine: Optional[PromptTemplateEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_prompt_templates() -> PromptTemplateEngine:
+    """
+    Global engine; templates are loaded from prompts/ on first use.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = PromptTemplateEngine()
+    return _engine
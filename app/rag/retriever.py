@@ -1,6 +1,7 @@
 # app/rag/retriever.py
 
-from typing import List
+import threading
+from typing import List, Optional
 from app.rag.vector_db import SimpleVectorDB, global_vector_db
 from app.rag.chunker import chunk_text
 
@@ -13,6 +14,13 @@ class Retriever:
     def __init__(self, vector_db: SimpleVectorDB):
         self.vector_db = vector_db
 
+    @property
+    def generation(self) -> int:
+        """
+        Index generation; changes whenever documents are added.
+        """
+        return self.vector_db.generation
+
     def search(self, query: str, top_k: int = 3) -> List[str]:
         """
         Generic search (backward compatible).
@@ -65,12 +73,22 @@ def build_retriever(cv_text: str, job_text: str) -> Retriever:
     return Retriever(vector_db)
 
 
+_global_retriever: Optional[Retriever] = None
+_global_lock = threading.Lock()
+
+
 def get_global_retriever() -> Retriever:
     """
     Get retriever for internal documents (global instance).
+    Built on first use; internal docs are ingested if the index is empty.
     """
-    return Retriever(global_vector_db)
-
-
-# Initialize global retriever
-global_retriever = get_global_retriever()
+    global _global_retriever
+    if _global_retriever is None:
+        with _global_lock:
+            if _global_retriever is None:
+                from app.rag.ingest import ingest_internal_docs
+
+                if not global_vector_db.documents:
+                    ingest_internal_docs(global_vector_db)
+                _global_retriever = Retriever(global_vector_db)
+    return _global_retriever
@@ -1,24 +1,37 @@
 # app/rag/vector_db.py
 
-from typing import List, Dict, Any, Optional
-import math
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet
+import re
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """
+    Lowercased word tokens (punctuation stripped).
+    """
+    return frozenset(TOKEN_RE.findall(text.lower()))
 
 
 class SimpleVectorDB:
     """
     Enhanced in-memory vector DB with metadata support.
     Token overlap similarity (no embeddings).
+    Documents are tokenized once on insert, not on every search.
     """
 
     def __init__(self):
         self.documents: List[str] = []
         self.metadatas: List[Dict[str, Any]] = []  # NEW: Metadata for each document
+        self.token_sets: List[FrozenSet[str]] = []
+        self.generation = 0  # Bumped on every write; used as a cache key
 
     def add_documents(self, docs: List[str], metadatas: Optional[List[Dict]] = None):
         """
         Add documents with optional metadata.
         """
         self.documents.extend(docs)
+        self.token_sets.extend(tokenize(doc) for doc in docs)
         
         if metadatas:
             self.metadatas.extend(metadatas)
@@ -26,20 +39,30 @@ class SimpleVectorDB:
             # Default metadata if not provided
             self.metadatas.extend([{} for _ in range(len(docs))])
 
+        self.generation += 1
+
     def similarity_search(self, query: str, top_k: int = 3) -> List[str]:
         """
         Search all documents (backward compatible).
         """
-        query_tokens = set(query.lower().split())
+        return [self.documents[idx] for _, idx in self.scored_search(query, top_k)]
 
-        scored = []
-        for doc in self.documents:
-            doc_tokens = set(doc.lower().split())
-            score = len(query_tokens & doc_tokens)
-            scored.append((score, doc))
+    def scored_search(
+        self,
+        query: str,
+        top_k: int = 3,
+        indices: Optional[List[int]] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Top-k (score, document index) pairs by token overlap.
+        Ties keep document order.
+        """
+        query_tokens = tokenize(query)
+        candidates = range(len(self.documents)) if indices is None else indices
 
+        scored = [(len(query_tokens & self.token_sets[idx]), idx) for idx in candidates]
         scored.sort(key=lambda x: x[0], reverse=True)
-        return [doc for score, doc in scored[:top_k]]
+        return scored[:top_k]
 
     def search_with_filter(
         self, 
@@ -60,17 +83,8 @@ class SimpleVectorDB:
                 filtered_indices.append(idx)
         
         # Step 2: Search only in filtered documents
-        query_tokens = set(query.lower().split())
-        scored = []
-        
-        for idx in filtered_indices:
-            doc = self.documents[idx]
-            doc_tokens = set(doc.lower().split())
-            score = len(query_tokens & doc_tokens)
-            scored.append((score, doc))
-        
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [doc for score, doc in scored[:top_k]]
+        scored = self.scored_search(query, top_k, indices=filtered_indices)
+        return [self.documents[idx] for _, idx in scored]
 
     def _matches_filter(self, metadata: Dict, filter_dict: Optional[Dict]) -> bool:
         """
@@ -0,0 +1,39 @@
+# app/storage/file_store.py
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+RESULTS_DIR = os.getenv("RESULTS_DIR", "data/results")
+
+
+class ResultStore:
+    """
+    Keeps full job result bodies (LLM feedback, summaries, raw scores) on
+    disk, one JSON file per job, so the in-memory job table stays small.
+    Results are read back only when a client asks for them.
+    """
+
+    def __init__(self, results_dir: str = RESULTS_DIR):
+        self.results_dir = Path(results_dir)
+
+    def _path(self, job_id: str) -> Path:
+        return self.results_dir / f"{job_id}.json"
+
+    def save(self, job_id: str, result: Dict[str, Any]):
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write-then-rename so readers never see a partial file
+        tmp_path = self.results_dir / f"{job_id}.json.tmp"
+        tmp_path.write_text(json.dumps(result), encoding="utf-8")
+        os.replace(tmp_path, self._path(job_id))
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._path(job_id).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def delete(self, job_id: str):
+        self._path(job_id).unlink(missing_ok=True)
@@ -0,0 +1,626 @@
+# app/storage/jobs_store.py
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.scheduler import WaitStats, tenant_weights_from_env
+
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "data/state/checkpoints.db")
+
+
+class CheckpointStore:
+    """
+    Durable (SQLite, WAL) store for in-flight jobs.
+
+    Keeps the job spec needed to re-run a job plus the output of every
+    completed pipeline stage. Rows are removed once the job finishes, so
+    whatever is left on startup is exactly the set of interrupted jobs.
+    """
+
+    def __init__(self, db_path: str = CHECKPOINT_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Open the database on first use (call with self._lock held).
+        """
+        if self._db is not None:
+            return self._db
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pending_jobs (
+                job_id TEXT PRIMARY KEY,
+                spec TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS stage_checkpoints (
+                job_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (job_id, stage)
+            );
+            """
+        )
+        conn.commit()
+        self._db = conn
+        return conn
+
+    def _write(self, sql: str, params: tuple):
+        with self._lock:
+            self._connection().execute(sql, params)
+            self._connection().commit()
+
+    def save_job(self, job_id: str, spec: Dict[str, Any]):
+        self._write(
+            "INSERT OR REPLACE INTO pending_jobs (job_id, spec) VALUES (?, ?)",
+            (job_id, json.dumps(spec))
+        )
+
+    def save_stage(self, job_id: str, stage: str, data: Any):
+        self._write(
+            "INSERT OR REPLACE INTO stage_checkpoints (job_id, stage, data) VALUES (?, ?, ?)",
+            (job_id, stage, json.dumps(data))
+        )
+
+    def load_stages(self, job_id: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT stage, data FROM stage_checkpoints WHERE job_id = ?",
+                (job_id,)
+            ).fetchall()
+        return {stage: json.loads(data) for stage, data in rows}
+
+    def finish_job(self, job_id: str):
+        with self._lock:
+            self._connection().execute("DELETE FROM stage_checkpoints WHERE job_id = ?", (job_id,))
+            self._connection().execute("DELETE FROM pending_jobs WHERE job_id = ?", (job_id,))
+            self._connection().commit()
+
+    def pending_jobs(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            rows = self._connection().execute("SELECT job_id, spec FROM pending_jobs").fetchall()
+        return [(job_id, json.loads(spec)) for job_id, spec in rows]
+
+
+class StageCheckpoint:
+    """
+    Per-job view of the checkpoint store used by the pipeline.
+    run(stage, fn) returns the saved output if the stage already completed,
+    otherwise runs fn and saves its output.
+    """
+
+    def __init__(self, store: CheckpointStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+        self._done = store.load_stages(job_id)
+
+    def run(
+        self,
+        stage: str,
+        fn: Callable[[], Any],
+        should_save: Callable[[Any], bool] = lambda _: True
+    ) -> Any:
+        if stage in self._done:
+            return self._done[stage]
+
+        output = fn()
+        if should_save(output):
+            self.store.save_stage(self.job_id, stage, output)
+            self._done[stage] = output
+        return output
+
+    def completed_stages(self) -> List[str]:
+        return list(self._done)
+
+
+SHARED_DB = os.getenv("SHARED_DB", "data/state/shared.db")
+
+# Priority classes in dispatch order (mirrors app.core.scheduler.Priority)
+_PRIORITY_RANK = {"interactive": 0, "bulk": 1}
+
+
+class SharedJobStore:
+    """
+    SQLite-backed job table + work queue shared by API and worker processes.
+
+    - jobs:  lifecycle state, result and dedup key
+    - idempotency_keys: Idempotency-Key -> job, with the request's dedup key
+    - queue: pending work; a worker claims a row with a lease and renews
+             it while the job runs; rows whose lease expired (worker died)
+             become claimable again
+    - queue_tenants / queue_clock: per-class tenant virtual times, so
+             claims share a class between tenants by weight like
+             FairScheduler (idle tenants are dropped as there)
+    - queue_waits: queue wait of the last wait_window first claims per
+             priority class, for the same percentiles as FairScheduler
+
+    One connection per thread; cross-process atomicity comes from
+    BEGIN IMMEDIATE transactions.
+    """
+
+    def __init__(self, db_path: str = SHARED_DB, lease_seconds: float = 120.0,
+                 bulk_max_wait: float = 30.0, aged_bulk_interval: int = 4,
+                 wait_window: int = 1000, tenant_weights: Optional[Dict[str, float]] = None):
+        self.db_path = db_path
+        self.tenant_weights = tenant_weights if tenant_weights is not None else tenant_weights_from_env()
+        self.lease_seconds = lease_seconds
+        self.wait_window = wait_window
+        self.bulk_max_wait = bulk_max_wait
+        self.aged_bulk_interval = aged_bulk_interval
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                job_title TEXT,
+                rank_score REAL,
+                dedup_key TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_dedup ON jobs (dedup_key);
+            CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_at, job_id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_updated ON jobs (status, updated_at, job_id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_title_updated ON jobs (job_title, updated_at, job_id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_title_updated ON jobs (status, job_title, updated_at, job_id);
+            DROP INDEX IF EXISTS idx_jobs_ranking;
+            CREATE INDEX IF NOT EXISTS idx_jobs_rank ON jobs (job_title, rank_score, job_id);
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                idempotency_key TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                dedup_key TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_idempotency_created ON idempotency_keys (created_at);
+            CREATE TABLE IF NOT EXISTS queue (
+                job_id TEXT PRIMARY KEY,
+                priority_rank INTEGER NOT NULL,
+                tenant TEXT NOT NULL,
+                spec TEXT NOT NULL,
+                enqueued_at REAL NOT NULL,
+                claimed_by TEXT,
+                lease_until REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_queue_order ON queue (priority_rank, enqueued_at);
+            CREATE INDEX IF NOT EXISTS idx_queue_tenant ON queue (priority_rank, tenant, enqueued_at);
+            CREATE TABLE IF NOT EXISTS queue_tenants (
+                priority_rank INTEGER NOT NULL,
+                tenant TEXT NOT NULL,
+                vtime REAL NOT NULL,
+                PRIMARY KEY (priority_rank, tenant)
+            );
+            CREATE TABLE IF NOT EXISTS queue_clock (
+                priority_rank INTEGER PRIMARY KEY,
+                clock REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS queue_waits (
+                id INTEGER PRIMARY KEY,
+                priority_rank INTEGER NOT NULL,
+                wait REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_queue_waits_rank ON queue_waits (priority_rank, id);
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; multi-statement writes use explicit transactions
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---- jobs ----
+
+    def insert_job(self, job_id: str, status: str, now: float, job_title: Optional[str] = None,
+                   dedup_key: Optional[str] = None):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO jobs "
+            "(job_id, status, created_at, updated_at, job_title, dedup_key) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, status, now, now, job_title, dedup_key)
+        )
+
+    def get_or_create_job(self, new_job_id: str, status: str, now: float, failed_status: str,
+                          dedup_key: Optional[str], idempotency_key: Optional[str],
+                          job_title: Optional[str] = None,
+                          key_ttl: Optional[float] = None) -> Tuple[str, bool, bool]:
+        """
+        Atomic single-flight lookup across processes.
+        Returns (job_id, created, conflict); conflict is True when the
+        idempotency key was registered with a different dedup key (i.e. a
+        different payload). Keys and dedup matches older than key_ttl
+        seconds are forgotten.
+        """
+        cutoff = now - key_ttl if key_ttl is not None else float("-inf")
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM idempotency_keys WHERE created_at < ?", (cutoff,))
+            if idempotency_key:
+                row = conn.execute(
+                    "SELECT job_id, dedup_key FROM idempotency_keys WHERE idempotency_key = ?",
+                    (idempotency_key,)
+                ).fetchone()
+                if row:
+                    conn.execute("COMMIT")
+                    return row[0], False, row[1] != dedup_key
+
+            job_id, created = None, False
+            if dedup_key:
+                row = conn.execute(
+                    "SELECT job_id FROM jobs WHERE dedup_key = ? AND status != ? AND created_at >= ? "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (dedup_key, failed_status, cutoff)
+                ).fetchone()
+                if row:
+                    job_id = row[0]
+            if job_id is None:
+                job_id, created = new_job_id, True
+                self.insert_job(job_id, status, now, job_title, dedup_key)
+
+            if idempotency_key:
+                conn.execute(
+                    "INSERT INTO idempotency_keys (idempotency_key, job_id, dedup_key, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (idempotency_key, job_id, dedup_key, now)
+                )
+            conn.execute("COMMIT")
+            return job_id, created, False
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update_job(self, job_id: str, status: str, now: float,
+                   result: Optional[Dict] = None, error: Optional[str] = None,
+                   rank_score: Optional[float] = None) -> bool:
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, rank_score = ? "
+            "WHERE job_id = ?",
+            (status, json.dumps(result) if result is not None else None, error, now, rank_score, job_id)
+        )
+        return cursor.rowcount > 0
+
+    _JOB_COLUMNS = "job_id, status, error, created_at, updated_at, job_title, result IS NOT NULL"
+
+    @staticmethod
+    def _job_row(row: tuple) -> Dict[str, Any]:
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "error": row[2],
+            "created_at": row[3],
+            "updated_at": row[4],
+            "job_title": row[5],
+            "has_result": bool(row[6]),
+        }
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Job state without the result body (see get_result).
+        """
+        row = self._conn().execute(
+            f"SELECT {self._JOB_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return self._job_row(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, job_title: Optional[str] = None,
+                  since: Optional[float] = None, until: Optional[float] = None,
+                  limit: int = 50, cursor: Optional[Tuple[float, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Newest-updated first, keyset-paginated on (updated_at, job_id) so
+        each page is an index range scan.
+        """
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if job_title is not None:
+            clauses.append("job_title = ?")
+            params.append(job_title)
+        if since is not None:
+            clauses.append("updated_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("updated_at <= ?")
+            params.append(until)
+        if cursor is not None:
+            clauses.append("(updated_at, job_id) < (?, ?)")
+            params.extend(cursor)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            f"SELECT {self._JOB_COLUMNS} FROM jobs {where} "
+            "ORDER BY updated_at DESC, job_id DESC LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [self._job_row(row) for row in rows]
+
+    def status_counts(self) -> Dict[str, int]:
+        rows = self._conn().execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        ).fetchall()
+        return dict(rows)
+
+    # ---- rankings ----
+
+    def top_ranked(self, job_title: str, n: int) -> List[Tuple[str, float]]:
+        return self._conn().execute(
+            "SELECT job_id, rank_score FROM jobs "
+            "WHERE job_title = ? AND rank_score IS NOT NULL "
+            "ORDER BY rank_score DESC, job_id LIMIT ?",
+            (job_title, n)
+        ).fetchall()
+
+    def rank_position(self, job_title: str, job_id: str) -> Optional[Tuple[float, int, int, int]]:
+        """
+        (score, better, lower, total) for one ranked job.
+
+        Two COUNT(*) range queries over the covering (job_title, rank_score,
+        job_id) index: no table rows are read, only index entries of this
+        job title above / below the score. SQLite keeps no subtree counts,
+        so this is linear in the title's ranked jobs (the in-process
+        RankingIndex answers in O(log n)).
+        """
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT rank_score FROM jobs WHERE job_id = ? AND job_title = ? AND rank_score IS NOT NULL",
+            (job_id, job_title)
+        ).fetchone()
+        if row is None:
+            return None
+
+        score = row[0]
+        at_or_above, better = conn.execute(
+            "SELECT COUNT(*), COUNT(*) FILTER (WHERE rank_score > ? OR job_id < ?) "
+            "FROM jobs WHERE job_title = ? AND rank_score >= ?",
+            (score, job_id, job_title, score)
+        ).fetchone()
+        lower = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE job_title = ? AND rank_score < ?",
+            (job_title, score)
+        ).fetchone()[0]
+        return score, better, lower, at_or_above + lower
+
+    def ranked_titles(self) -> Dict[str, int]:
+        rows = self._conn().execute(
+            "SELECT job_title, COUNT(*) FROM jobs WHERE rank_score IS NOT NULL GROUP BY job_title"
+        ).fetchall()
+        return dict(rows)
+
+    def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT result FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    # ---- queue ----
+
+    def enqueue(self, job_id: str, spec: Dict[str, Any], priority: str, tenant: str):
+        if priority not in _PRIORITY_RANK:
+            raise ValueError(f"Unknown priority: {priority}")
+        rank = _PRIORITY_RANK[priority]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            backlogged = conn.execute(
+                "SELECT 1 FROM queue WHERE priority_rank = ? AND tenant = ? AND claimed_by IS NULL LIMIT 1",
+                (rank, tenant)
+            ).fetchone()
+            if backlogged is None:
+                # Newly backlogged tenants join at the class clock (no saved credit)
+                conn.execute(
+                    "INSERT INTO queue_tenants (priority_rank, tenant, vtime) VALUES (?, ?, ?) "
+                    "ON CONFLICT (priority_rank, tenant) DO UPDATE SET vtime = MAX(vtime, excluded.vtime)",
+                    (rank, tenant, self._clock(conn, rank))
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO queue (job_id, priority_rank, tenant, spec, enqueued_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, rank, tenant, json.dumps(spec), time.time())
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _clock(conn: sqlite3.Connection, rank: int) -> float:
+        row = conn.execute("SELECT clock FROM queue_clock WHERE priority_rank = ?", (rank,)).fetchone()
+        return row[0] if row else 0.0
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, Dict[str, Any], str]]:
+        """
+        Claim the next job: interactive first. Bulk jobs aged past
+        bulk_max_wait get roughly one in every aged_bulk_interval claims
+        (chosen at random, so no shared counter is needed across
+        processes). Within a class, the backlogged tenant with the smallest
+        virtual time goes next (its oldest job), and its virtual time
+        advances by 1/weight, as in FairScheduler. Expired leases are
+        reclaimable.
+
+        Returns (job_id, spec, token); the token identifies this claim for
+        renew() and ack(), so a worker whose lease expired cannot touch a
+        job that was claimed again.
+        """
+        now = time.time()
+        claimable = "(q.claimed_by IS NULL OR q.lease_until < ?)"
+        conn = self._conn()
+
+        # Idle workers poll an empty queue; check it without taking the write lock
+        if conn.execute(f"SELECT 1 FROM queue q WHERE {claimable} LIMIT 1", (now,)).fetchone() is None:
+            return None
+
+        token = f"{worker_id}:{uuid.uuid4().hex[:8]}"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Pick the class, and for aged bulk work the latest enqueue time
+            rank, cutoff = None, now
+            if random.random() < 1.0 / self.aged_bulk_interval:
+                aged = conn.execute(
+                    f"SELECT 1 FROM queue q WHERE {claimable} "
+                    "AND q.priority_rank = ? AND q.enqueued_at < ? LIMIT 1",
+                    (now, _PRIORITY_RANK["bulk"], now - self.bulk_max_wait)
+                ).fetchone()
+                if aged is not None:
+                    rank, cutoff = _PRIORITY_RANK["bulk"], now - self.bulk_max_wait
+            if rank is None:
+                row = conn.execute(
+                    f"SELECT q.priority_rank FROM queue q WHERE {claimable} "
+                    "ORDER BY q.priority_rank, q.enqueued_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                rank = row[0]
+
+            # Then the tenant: smallest virtual time with claimable work
+            row = conn.execute(
+                "SELECT t.tenant, t.vtime FROM queue_tenants t "
+                "WHERE t.priority_rank = ? AND EXISTS ("
+                f"  SELECT 1 FROM queue q WHERE q.priority_rank = t.priority_rank "
+                f"  AND q.tenant = t.tenant AND {claimable} AND q.enqueued_at <= ?"
+                ") ORDER BY t.vtime, t.tenant LIMIT 1",
+                (rank, now, cutoff)
+            ).fetchone()
+            if row is None:
+                # Rows enqueued without a tenant entry (older database): oldest first
+                row = conn.execute(
+                    f"SELECT q.tenant FROM queue q WHERE q.priority_rank = ? AND {claimable} "
+                    "AND q.enqueued_at <= ? ORDER BY q.enqueued_at LIMIT 1",
+                    (rank, now, cutoff)
+                ).fetchone()
+                tenant, vtime = row[0], self._clock(conn, rank)
+            else:
+                tenant, vtime = row
+
+            job_id, spec, enqueued_at, previous_claim = conn.execute(
+                f"SELECT q.job_id, q.spec, q.enqueued_at, q.claimed_by FROM queue q "
+                f"WHERE q.priority_rank = ? AND q.tenant = ? AND {claimable} AND q.enqueued_at <= ? "
+                "ORDER BY q.enqueued_at LIMIT 1",
+                (rank, tenant, now, cutoff)
+            ).fetchone()
+
+            conn.execute(
+                "INSERT OR REPLACE INTO queue_clock (priority_rank, clock) VALUES (?, ?)", (rank, vtime)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO queue_tenants (priority_rank, tenant, vtime) VALUES (?, ?, ?)",
+                (rank, tenant, vtime + 1.0 / self.tenant_weights.get(tenant, 1.0))
+            )
+            conn.execute(
+                "UPDATE queue SET claimed_by = ?, lease_until = ? WHERE job_id = ?",
+                (token, now + self.lease_seconds, job_id)
+            )
+            if previous_claim is None:
+                # A reclaim after an expired lease would count the lost run as waiting
+                self._record_wait(conn, rank, now - enqueued_at)
+            conn.execute("COMMIT")
+            return job_id, json.loads(spec), token
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def renew(self, job_id: str, token: str) -> bool:
+        """
+        Extend the lease of a claim. False if the claim was lost.
+        """
+        cursor = self._conn().execute(
+            "UPDATE queue SET lease_until = ? WHERE job_id = ? AND claimed_by = ?",
+            (time.time() + self.lease_seconds, job_id, token)
+        )
+        return cursor.rowcount == 1
+
+    def ack(self, job_id: str, token: str) -> bool:
+        """
+        Remove a finished job from the queue. False if the claim was lost.
+        Forgets idle tenants the way FairScheduler does: all of a class once
+        it drains, otherwise those whose virtual time fell behind the clock.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT priority_rank FROM queue WHERE job_id = ? AND claimed_by = ?", (job_id, token)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return False
+
+            rank = row[0]
+            conn.execute("DELETE FROM queue WHERE job_id = ?", (job_id,))
+            if conn.execute("SELECT 1 FROM queue WHERE priority_rank = ? LIMIT 1", (rank,)).fetchone() is None:
+                conn.execute("DELETE FROM queue_tenants WHERE priority_rank = ?", (rank,))
+                conn.execute("DELETE FROM queue_clock WHERE priority_rank = ?", (rank,))
+            else:
+                conn.execute(
+                    "DELETE FROM queue_tenants WHERE priority_rank = ? AND vtime <= ? AND NOT EXISTS ("
+                    "  SELECT 1 FROM queue q WHERE q.priority_rank = queue_tenants.priority_rank "
+                    "  AND q.tenant = queue_tenants.tenant)",
+                    (rank, self._clock(conn, rank))
+                )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _record_wait(self, conn: sqlite3.Connection, rank: int, wait: float):
+        cursor = conn.execute(
+            "INSERT INTO queue_waits (priority_rank, wait) VALUES (?, ?)", (rank, wait)
+        )
+        # Keep only the newest wait_window samples of the class
+        conn.execute(
+            "DELETE FROM queue_waits WHERE priority_rank = ? AND id <= ?",
+            (rank, cursor.lastrowid - self.wait_window)
+        )
+
+    def queue_stats(self) -> Dict[str, Dict]:
+        """
+        Same shape as FairScheduler.stats(): depth, backlogged tenants and
+        wait-time percentiles per priority class.
+        """
+        conn = self._conn()
+        stats = {}
+        for priority, rank in _PRIORITY_RANK.items():
+            queued, tenants = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT tenant) FROM queue "
+                "WHERE priority_rank = ? AND claimed_by IS NULL",
+                (rank,)
+            ).fetchone()
+            wait_stats = WaitStats(self.wait_window)
+            for (wait,) in conn.execute(
+                "SELECT wait FROM queue_waits WHERE priority_rank = ? ORDER BY id DESC LIMIT ?",
+                (rank, self.wait_window)
+            ):
+                wait_stats.record(wait)
+            stats[priority] = {
+                "queued": queued,
+                "tenants": tenants,
+                "wait_seconds": wait_stats.snapshot(),
+            }
+        return stats
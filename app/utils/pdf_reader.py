@@ -1,20 +1,209 @@
 # app/utils/pdf_reader.py
 
-from pypdf import PdfReader
+import hashlib
+import importlib
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterator, Optional
 
 
-def extract_text_from_pdf(file_path: str) -> str:
+def file_fingerprint(file_path: str) -> str:
+    """
+    SHA-256 of the file content.
+    Used as a stable document key (independent of upload filename).
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PageTextCache:
+    """
+    Disk-backed per-page text cache.
+    Each extracted page is stored under the document fingerprint, so a
+    partially processed document resumes from the first uncached page.
+
+    Bounded: when a new document is added, documents unused for max_age
+    seconds are removed, then the least recently used ones beyond max_docs.
+    Reading a document's page count marks it as used.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_docs: Optional[int] = None,
+        max_age: Optional[float] = None
+    ):
+        """
+        Defaults come from PAGE_CACHE_DIR / PAGE_CACHE_MAX_DOCS /
+        PAGE_CACHE_MAX_AGE, read when the cache is created (after .env).
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("PAGE_CACHE_DIR", "data/cache/pages"))
+        self.max_docs = (
+            max_docs if max_docs is not None
+            else int(os.getenv("PAGE_CACHE_MAX_DOCS", "1000"))
+        )
+        self.max_age = (
+            max_age if max_age is not None
+            else float(os.getenv("PAGE_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+        )
+
+    def get(self, doc_key: str, page_no: int) -> Optional[str]:
+        path = self.cache_dir / doc_key / f"{page_no}.txt"
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def put(self, doc_key: str, page_no: int, text: str):
+        self._write(doc_key, f"{page_no}.txt", text)
+
+    def get_page_count(self, doc_key: str) -> Optional[int]:
+        doc_dir = self.cache_dir / doc_key
+        try:
+            count = int((doc_dir / "page_count").read_text())
+            os.utime(doc_dir)
+        except (FileNotFoundError, ValueError):
+            return None
+        return count
+
+    def put_page_count(self, doc_key: str, page_count: int):
+        self._write(doc_key, "page_count", str(page_count))
+
+    def _write(self, doc_key: str, name: str, text: str):
+        doc_dir = self.cache_dir / doc_key
+        if not doc_dir.exists():
+            doc_dir.mkdir(parents=True, exist_ok=True)
+            self.prune(keep=doc_key)
+
+        # Write-then-rename so a crash never leaves a truncated page behind
+        tmp_path = doc_dir / f"{name}.tmp"
+        try:
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, doc_dir / name)
+        except FileNotFoundError:
+            pass  # evicted concurrently; the cache is best-effort
+
+    def prune(self, keep: Optional[str] = None):
+        """
+        Evict expired documents, then the least recently used beyond max_docs.
+        """
+        try:
+            docs = [(entry.stat().st_mtime, entry) for entry in os.scandir(self.cache_dir) if entry.is_dir()]
+        except FileNotFoundError:
+            return
+        docs.sort(key=lambda item: item[0])
+
+        cutoff = time.time() - self.max_age
+        excess = len(docs) - self.max_docs
+        for mtime, entry in docs:
+            if entry.name == keep:
+                continue
+            if mtime < cutoff or excess > 0:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                excess -= 1
+
+
+class NoPageCache(PageTextCache):
+    """
+    Page cache that never hits and never writes, so every job parses its
+    PDFs (comparable timings for benchmarks and replays).
+    """
+
+    def __init__(self):
+        super().__init__(cache_dir=os.devnull)
+
+    def get(self, doc_key: str, page_no: int) -> Optional[str]:
+        return None
+
+    def put(self, doc_key: str, page_no: int, text: str):
+        pass
+
+    def get_page_count(self, doc_key: str) -> Optional[int]:
+        return None
+
+    def put_page_count(self, doc_key: str, page_count: int):
+        pass
+
+
+def iter_pdf_pages(
+    file_path: str,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    cache: Optional[PageTextCache] = None
+) -> Iterator[str]:
+    """
+    Lazily yield the text of each PDF page.
+    Stops early once max_pages pages or max_chars characters were produced.
+    Pages without text are skipped. The PDF is only parsed if some needed
+    page is not cached.
+    """
+    if max_pages is not None and max_pages <= 0:
+        raise ValueError("max_pages must be positive")
+    if max_chars is not None and max_chars <= 0:
+        raise ValueError("max_chars must be positive")
+
+    reader = None
+
+    def get_reader():
+        nonlocal reader
+        if reader is None:
+            from pypdf import PdfReader  # deferred: keeps app import fast
+            reader = PdfReader(file_path)
+        return reader
+
+    doc_key = file_fingerprint(file_path) if cache else None
+    page_count = cache.get_page_count(doc_key) if cache else None
+    if page_count is None:
+        page_count = len(get_reader().pages)
+        if cache:
+            cache.put_page_count(doc_key, page_count)
+
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+
+    remaining = max_chars
+    for page_no in range(page_count):
+        text = cache.get(doc_key, page_no) if cache else None
+        if text is None:
+            text = get_reader().pages[page_no].extract_text() or ""
+            if cache:
+                cache.put(doc_key, page_no, text)
+
+        if not text:
+            continue
+
+        if remaining is not None:
+            if len(text) >= remaining:
+                yield text[:remaining]
+                return
+            remaining -= len(text)
+
+        yield text
+
+
+def warm_up():
+    """
+    Import the PDF parser ahead of the first job.
+    """
+    importlib.import_module("pypdf")
+
+
+def extract_text_from_pdf(
+    file_path: str,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    cache: Optional[PageTextCache] = None
+) -> str:
     """
     Extract plain text from a PDF file.
     Simple & deterministic (sufficient for case study).
     """
-    reader = PdfReader(file_path)
-
-    pages_text = []
-    for page in reader.pages:
-        text = page.extract_text()
-        if text:
-            pages_text.append(text)
+    pages_text = list(iter_pdf_pages(file_path, max_pages, max_chars, cache))
 
     if not pages_text:
         raise ValueError("PDF contains no readable text")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: bytes retained per completed job in the job manager.
+
+Compares the previous representation (dict with ISO timestamp strings and
+the full result body inline) with JobRecord + ResultStore.
+
+    python scripts/bench_job_memory.py --jobs 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.job_manager import JobManager
+from app.storage.file_store import ResultStore
+
+
+def sample_result(idx: int) -> dict:
+    """Result shaped like full_evaluation_pipeline output, realistic sizes."""
+    return {
+        "cv_match_rate": 0.5 + (idx % 50) / 100,
+        "cv_feedback": f"Candidate {idx}: solid backend fundamentals. " * 12,
+        "project_score": 3.0 + (idx % 20) / 10,
+        "project_feedback": f"Project {idx}: RAG pipeline meets requirements. " * 14,
+        "overall_summary": f"Summary {idx}: strong fit with some gaps. " * 30,
+        "cv_details": {"technical_skills": 4, "experience": 3, "achievements": 4, "cultural_fit": 4},
+        "project_details": {"correctness": 4, "code_quality": 4, "resilience": 3,
+                            "documentation": 4, "creativity": 3},
+    }
+
+
+def legacy_jobs(count: int) -> dict:
+    """Previous JobManager layout."""
+    jobs = {}
+    for idx in range(count):
+        job_id = str(uuid.uuid4())
+        jobs[job_id] = {
+            "job_id": job_id,
+            "status": "completed",
+            "result": sample_result(idx),
+            "error": None,
+            "created_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+            "updated_at": datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+        }
+    return jobs
+
+
+def compact_jobs(count: int, results_dir: str) -> JobManager:
+    manager = JobManager(ResultStore(results_dir))
+    for idx in range(count):
+        job_id = manager.create_job()
+        manager.set_completed(job_id, sample_result(idx))
+    return manager
+
+
+def measure(build, *args) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    retained = build(*args)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del retained
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job record memory benchmark")
+    parser.add_argument("--jobs", type=int, default=20000)
+    args = parser.parse_args()
+
+    legacy = measure(legacy_jobs, args.jobs)
+    with tempfile.TemporaryDirectory() as results_dir:
+        compact = measure(compact_jobs, args.jobs, results_dir)
+
+    print(f"📊 {args.jobs} completed jobs retained in memory")
+    print(f"  dict + inline result:     {legacy / args.jobs:>8.0f} bytes/job")
+    print(f"  JobRecord + ResultStore:  {compact / args.jobs:>8.0f} bytes/job")
+    print(f"  reduction:                {legacy / compact:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
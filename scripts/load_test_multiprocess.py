@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Multi-process load test for the shared SQLite queue.
+
+Enqueues N jobs built from the PDFs in data/uploads/ and drains them with
+1, 2, 4, ... worker processes. The LLM is replaced by an instant stub and
+the page cache is disabled, so the measured time is the CPU-bound part
+(PDF parsing, retrieval, prompt building) plus queue overhead.
+
+Every job gets its own copy of its PDFs with a unique trailer, so no
+content-keyed cache can serve one job's parse to another.
+
+    python scripts/load_test_multiprocess.py --jobs 200 --max-workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STUB_RESPONSE = '{"scores": {}, "match_rate": 0.5, "project_score": 3.0, "feedback": "stub"}'
+
+
+def run_stub_worker(shared_db: str, state_dir: str, ready):
+    """One worker process with the LLM stubbed out."""
+    # Per-job pipeline logging would dominate the measurement
+    sys.stdout = open(os.devnull, "w")
+
+    from app.ai import llm_client
+    from app.ai.evaluator import full_evaluation_pipeline
+    from app.core.worker import ProcessWorker
+    from app.rag.retriever import get_global_retriever
+    from app.storage.jobs_store import CheckpointStore, SharedJobStore
+    from app.utils.pdf_reader import NoPageCache
+
+    llm_client.get_model_router().complete_fn = lambda model, prompt: STUB_RESPONSE
+
+    # Ingest internal docs before the clock starts, so retrieval does real work
+    get_global_retriever()
+
+    worker = ProcessWorker(
+        SharedJobStore(shared_db),
+        full_evaluation_pipeline,
+        concurrency=1,
+        poll_interval=0.01,
+        # Uncached: every job parses its PDFs
+        page_cache=NoPageCache(),
+        checkpoint_store=CheckpointStore(os.path.join(state_dir, "checkpoints.db"))
+    )
+    # Start the clock only once every process finished its imports/setup
+    ready.wait()
+    worker.serve_forever()
+
+
+def pdf_pairs():
+    uploads = Path("data/uploads")
+    pairs = []
+    for cv_path in sorted(uploads.glob("*_cv.pdf")):
+        prefix = cv_path.name[:-len("_cv.pdf")]
+        for suffix in ("_project.pdf", "_job.pdf"):
+            other = uploads / f"{prefix}{suffix}"
+            if other.exists():
+                pairs.append((str(cv_path), str(other)))
+                break
+    return pairs
+
+
+def unique_copy(pdf_path: str, out_dir: str, tag: str) -> str:
+    """
+    Copy a PDF with a comment appended after %%EOF: same text, new content hash.
+    """
+    out_path = os.path.join(out_dir, f"{tag}_{os.path.basename(pdf_path)}")
+    with open(pdf_path, "rb") as src, open(out_path, "wb") as dst:
+        dst.write(src.read())
+        dst.write(f"\n% {tag}\n".encode())
+    return out_path
+
+
+def run_round(num_workers: int, num_jobs: int) -> float:
+    from app.core.job_manager import SharedJobManager, JobStatus
+    from app.core.worker import SharedQueueDispatcher
+    from app.storage.jobs_store import SharedJobStore
+
+    state_dir = tempfile.mkdtemp(prefix="loadtest-")
+    shared_db = os.path.join(state_dir, "shared.db")
+    store = SharedJobStore(shared_db)
+    job_manager = SharedJobManager(store)
+    dispatcher = SharedQueueDispatcher(store)
+
+    inputs_dir = os.path.join(state_dir, "inputs")
+    os.makedirs(inputs_dir)
+    pairs = pdf_pairs()
+    for idx in range(num_jobs):
+        cv_path, project_path = pairs[idx % len(pairs)]
+        job_id = job_manager.create_job()
+        dispatcher.run_job(
+            job_id,
+            unique_copy(cv_path, inputs_dir, f"job{idx}"),
+            unique_copy(project_path, inputs_dir, f"job{idx}"),
+            task_fn=None
+        )
+
+    ready = multiprocessing.Barrier(num_workers + 1)
+    processes = [
+        multiprocessing.Process(
+            target=run_stub_worker, args=(shared_db, state_dir, ready), daemon=True
+        )
+        for _ in range(num_workers)
+    ]
+    for process in processes:
+        process.start()
+    ready.wait()
+    start = time.perf_counter()
+
+    while True:
+        counts = job_manager.status_counts()
+        if counts[JobStatus.COMPLETED.value] + counts[JobStatus.FAILED.value] == num_jobs:
+            break
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - start
+
+    for process in processes:
+        process.terminate()
+        process.join()
+
+    failed = counts[JobStatus.FAILED.value]
+    if failed:
+        print(f"  ⚠️ {failed} job(s) failed")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process queue load test")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"📊 {args.jobs} jobs, LLM stubbed, page cache off\n")
+    print(f"{'workers':>8} {'seconds':>9} {'jobs/s':>9} {'jobs/s/worker':>14} {'speedup':>8}")
+
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        elapsed = run_round(workers, args.jobs)
+        throughput = args.jobs / elapsed
+        baseline = baseline or throughput
+        print(
+            f"{workers:>8} {elapsed:>9.2f} {throughput:>9.1f} "
+            f"{throughput / workers:>14.2f} {throughput / baseline:>7.2f}x"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    # Change to project root directory
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(project_root)
+
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Offline replay / regression harness for evaluation traffic.
+
+A trace (app/core/tracing.py) holds one job's input PDFs, digests of the
+parsed text, every prompt and LLM response, per-stage timings and the
+final scores. Traces come from workers running with TRACE_RECORD_PATH set,
+or from recording the PDFs in data/uploads/:
+
+    python scripts/replay_traffic.py record --output data/traces/baseline.jsonl
+
+Replay them against the current code:
+
+    python scripts/replay_traffic.py replay data/traces/baseline.jsonl --mode cached
+    python scripts/replay_traffic.py replay data/traces/baseline.jsonl --mode stub --concurrency 8
+
+- cached: LLM responses come from the trace with no LLM latency. Stage
+  timings isolate parsing, chunking and retrieval, and any score change
+  is caused by the code under test.
+- stub: canned responses after a synthetic delay (the recorded latency of
+  each call, or --stub-latency), to measure throughput under LLM-like load.
+
+The report shows per-stage latency deltas vs the recorded traces,
+throughput, changed parse/prompt outputs and changed scores. For timing
+comparisons, record on the same machine (or replay the baseline branch
+with --output and use that file as the baseline). The page cache is
+disabled, so every job parses its PDFs.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import load_env
+
+load_env()
+
+from app.ai import llm_client
+from app.ai.evaluator import full_evaluation_pipeline
+from app.ai.llm_client import ModelRouter
+from app.core.job_manager import JobManager
+from app.core.tracing import JobTrace, TraceRecorder, current_trace, load_traces
+from app.core.worker import AsyncWorker, DEFAULT_JOB_TITLE
+from app.rag.retriever import get_global_retriever
+from app.storage.file_store import ResultStore
+from app.storage.jobs_store import CheckpointStore
+from app.utils import pdf_reader
+
+STUB_RESPONSE = '{"scores": {}, "match_rate": 0.5, "project_score": 3.0, "feedback": "stub"}'
+
+SCORE_FIELDS = ("cv_match_rate", "project_score")
+
+# Slowdowns smaller than this are timer noise, not regressions
+MIN_REGRESSION_MS = 1.0
+
+
+class CollectingRecorder(TraceRecorder):
+    """
+    Writes traces like TraceRecorder and signals once `expected` arrived.
+    """
+
+    def __init__(self, path: str, expected: int):
+        super().__init__(path)
+        self.expected = expected
+        self.traces: List[JobTrace] = []
+        self.done = threading.Event()
+
+    def record(self, trace: JobTrace):
+        super().record(trace)
+        with self._lock:
+            self.traces.append(trace)
+            if len(self.traces) >= self.expected:
+                self.done.set()
+
+
+class ReplayRouter(ModelRouter):
+    """
+    Answers LLM calls from the recorded trace of the job being replayed.
+    sources maps replay job_id → recorded trace.
+    """
+
+    def __init__(self, mode: str, sources: Dict[str, JobTrace], stub_latency: Optional[float] = None):
+        super().__init__(routes={"default": ["replay"]}, hedge_delay=0)
+        self.mode = mode
+        self.sources = sources
+        self.stub_latency = stub_latency
+
+    def _recorded_call(self, stage: str) -> Optional[Dict]:
+        trace = current_trace()
+        source = self.sources.get(trace.job_id) if trace else None
+        if source is None:
+            return None
+        for call in source.llm_calls:
+            if call["stage"] == stage and call.get("error") is None:
+                return call
+        return None
+
+    def call(self, prompt: str, stage: str = "default") -> str:
+        recorded = self._recorded_call(stage)
+
+        if self.mode == "stub":
+            if self.stub_latency is not None:
+                time.sleep(self.stub_latency)
+            elif recorded is not None:
+                time.sleep(recorded["latency"])
+            return STUB_RESPONSE
+
+        if recorded is None:
+            raise RuntimeError(f"No recorded LLM response for stage '{stage}'")
+        return recorded["response"]
+
+
+def pdf_pairs() -> List[Tuple[str, str]]:
+    uploads = Path("data/uploads")
+    pairs = []
+    for cv_path in sorted(uploads.glob("*_cv.pdf")):
+        prefix = cv_path.name[:-len("_cv.pdf")]
+        for suffix in ("_project.pdf", "_job.pdf"):
+            other = uploads / f"{prefix}{suffix}"
+            if other.exists():
+                pairs.append((str(cv_path), str(other)))
+                break
+    return pairs
+
+
+def run_jobs(
+    specs: List[Tuple[str, str, str]],
+    concurrency: int,
+    output_path: str,
+    sources: Optional[List[JobTrace]] = None,
+    router: Optional[ReplayRouter] = None
+) -> List[JobTrace]:
+    """
+    Run (cv_path, project_path, job_title) specs through a fresh AsyncWorker
+    and return their traces. With a ReplayRouter, sources[i] is the recorded
+    trace replayed by specs[i].
+    """
+    state_dir = tempfile.mkdtemp(prefix="replay-")
+    recorder = CollectingRecorder(output_path, expected=len(specs))
+    job_manager = JobManager(result_store=ResultStore(os.path.join(state_dir, "results")))
+    worker = AsyncWorker(
+        job_manager,
+        page_cache=pdf_reader.NoPageCache(),
+        concurrency=concurrency,
+        checkpoint_store=CheckpointStore(os.path.join(state_dir, "checkpoints.db")),
+        trace_recorder=recorder
+    )
+
+    # Imports and the internal-docs index are not part of the measurement
+    pdf_reader.warm_up()
+    get_global_retriever()
+
+    # Per-job pipeline logging would drown the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for idx, (cv_path, project_path, job_title) in enumerate(specs):
+            job_id = job_manager.create_job(job_title)
+            if router is not None:
+                router.sources[job_id] = sources[idx]
+            worker.run_job(job_id, cv_path, project_path, full_evaluation_pipeline, job_title)
+        recorder.done.wait()
+
+    return recorder.traces
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+def throughput(traces: List[JobTrace]) -> Optional[float]:
+    timed = [t for t in traces if t.finished_at is not None]
+    if not timed:
+        return None
+    span = max(t.finished_at for t in timed) - min(t.started_at for t in timed)
+    return len(timed) / span if span > 0 else None
+
+
+def stage_names(traces: List[JobTrace]) -> List[str]:
+    names: Dict[str, None] = {}
+    for trace in traces:
+        for name in trace.stages:
+            names.setdefault(name)
+    return list(names)
+
+
+def compare(
+    pairs: List[Tuple[JobTrace, JobTrace]],
+    mode: str,
+    max_regression: Optional[float],
+    fail_on_score_change: bool
+) -> bool:
+    """
+    Print the regression report for (recorded, replayed) trace pairs.
+    Returns False if a configured gate failed.
+    """
+    recorded = [source for source, _ in pairs]
+    replayed = [replay for _, replay in pairs]
+    ok = True
+
+    before, after = throughput(recorded), throughput(replayed)
+    print(f"\n📊 {len(pairs)} job(s) replayed, mode={mode}")
+    print(
+        "Throughput: recorded "
+        + (f"{before:.2f} jobs/s" if before else "n/a")
+        + " → replay "
+        + (f"{after:.2f} jobs/s" if after else "n/a")
+    )
+
+    print(f"\n{'stage':<18} {'rec p50':>9} {'rep p50':>9} {'delta':>8} {'rec p95':>9} {'rep p95':>9}")
+    for name in stage_names(replayed):
+        if mode == "cached" and name.endswith(".llm"):
+            continue
+        rec = [t.stages[name] * 1000 for t in recorded if name in t.stages]
+        rep = [t.stages[name] * 1000 for t in replayed if name in t.stages]
+        rec_p50, rep_p50 = percentile(rec, 0.5), percentile(rep, 0.5)
+        delta = (rep_p50 - rec_p50) / rec_p50 * 100 if rec_p50 > 0 else None
+        flag = ""
+        if (
+            max_regression is not None
+            and delta is not None
+            and delta > max_regression
+            and rep_p50 - rec_p50 >= MIN_REGRESSION_MS
+        ):
+            flag, ok = " ❌", False
+        delta_text = f"{delta:+.0f}%" if delta is not None else "-"
+        print(
+            f"{name:<18} {rec_p50:>8.1f}ms {rep_p50:>7.1f}ms {delta_text:>8} "
+            f"{percentile(rec, 0.95):>7.1f}ms {percentile(rep, 0.95):>7.1f}ms{flag}"
+        )
+
+    # Changed stage outputs explain changed scores
+    print("\nChanged outputs:")
+    for name in ("cv_text", "project_text"):
+        changed = sum(
+            1 for source, replay in pairs
+            if name in source.digests and source.digests[name] != replay.digests.get(name)
+        )
+        print(f"  {name:<16} {changed} job(s)")
+    # Stub responses feed the summary prompt, so it only compares in cached mode
+    prompt_stages = ("cv", "project", "summary") if mode == "cached" else ("cv", "project")
+    for stage in prompt_stages:
+        changed = 0
+        for source, replay in pairs:
+            old = [c["prompt_digest"] for c in source.llm_calls if c["stage"] == stage]
+            new = [c["prompt_digest"] for c in replay.llm_calls if c["stage"] == stage]
+            if old and old[:1] != new[:1]:
+                changed += 1
+        print(f"  {stage + ' prompt':<16} {changed} job(s)")
+
+    if mode != "cached":
+        print("\nScores not compared: stub mode returns canned LLM responses")
+        return ok
+
+    changes = []
+    for source, replay in pairs:
+        old, new = source.result or {}, replay.result or {}
+        for field in SCORE_FIELDS:
+            if old.get(field) != new.get(field):
+                changes.append((source.job_id, field, old.get(field), new.get(field)))
+        if (source.error is None) != (replay.error is None):
+            changes.append((source.job_id, "error", source.error, replay.error))
+
+    print(f"\nScore changes: {len(changes)}")
+    for job_id, field, old, new in changes:
+        print(f"  {job_id} {field}: {old} → {new}")
+    if changes and fail_on_score_change:
+        ok = False
+    return ok
+
+
+def record(args):
+    pairs = pdf_pairs()
+    if args.limit:
+        pairs = pairs[:args.limit]
+    if not pairs:
+        print("❌ No CV/project PDF pairs found in data/uploads/")
+        sys.exit(1)
+
+    specs = [(cv, project, args.job_title) for cv, project in pairs]
+    print(f"🎙️ Recording {len(specs)} job(s) → {args.output}")
+    traces = run_jobs(specs, args.concurrency, args.output)
+    failed = sum(1 for t in traces if t.error)
+    print(f"✅ Recorded {len(traces)} trace(s), {failed} failed")
+
+
+def replay(args):
+    sources: List[JobTrace] = []
+    for path in args.traces:
+        sources.extend(load_traces(path))
+
+    # Skip traces whose documents are gone or changed since recording
+    replayable = []
+    for trace in sources:
+        inputs = trace.inputs
+        try:
+            current = (
+                pdf_reader.file_fingerprint(inputs["cv_pdf_path"]),
+                pdf_reader.file_fingerprint(inputs["project_pdf_path"]),
+            )
+        except OSError:
+            continue
+        if current == (inputs.get("cv_fingerprint"), inputs.get("project_fingerprint")):
+            replayable.append(trace)
+    if len(replayable) < len(sources):
+        print(f"⚠️ Skipping {len(sources) - len(replayable)} trace(s) with missing or changed PDFs")
+    if not replayable:
+        print("❌ Nothing to replay")
+        sys.exit(1)
+
+    replayable = replayable * args.repeat
+    specs = [
+        (t.inputs["cv_pdf_path"], t.inputs["project_pdf_path"], t.inputs.get("job_title", DEFAULT_JOB_TITLE))
+        for t in replayable
+    ]
+
+    router = ReplayRouter(args.mode, {}, stub_latency=args.stub_latency)
+    llm_client.set_model_router(router)
+
+    output = args.output or os.path.join(tempfile.mkdtemp(prefix="replay-"), "replay.jsonl")
+    traces = run_jobs(specs, args.concurrency, output, sources=replayable, router=router)
+    print(f"Replay traces written to {output}")
+
+    pairs = [(router.sources[t.job_id], t) for t in traces]
+    if not compare(pairs, args.mode, args.max_regression, args.fail_on_score_change):
+        print("\n❌ Regression gate failed")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay evaluation traffic")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Record traces for the PDFs in data/uploads/")
+    record_parser.add_argument("--output", default="data/traces/baseline.jsonl")
+    record_parser.add_argument("--job-title", default=DEFAULT_JOB_TITLE)
+    record_parser.add_argument("--limit", type=int, default=0)
+    record_parser.add_argument("--concurrency", type=int, default=4)
+    record_parser.set_defaults(func=record)
+
+    replay_parser = commands.add_parser("replay", help="Replay recorded traces and report regressions")
+    replay_parser.add_argument("traces", nargs="+", help="Trace JSONL file(s)")
+    replay_parser.add_argument("--mode", choices=("cached", "stub"), default="cached")
+    replay_parser.add_argument("--stub-latency", type=float, default=None,
+                               help="Fixed LLM delay in stub mode (default: recorded latency)")
+    replay_parser.add_argument("--concurrency", type=int, default=4)
+    replay_parser.add_argument("--repeat", type=int, default=1)
+    replay_parser.add_argument("--output", default=None, help="Where to write the replay traces")
+    replay_parser.add_argument("--max-regression", type=float, default=None,
+                               help="Fail if a stage's p50 is slower by more than this percentage")
+    replay_parser.add_argument("--fail-on-score-change", action="store_true")
+    replay_parser.set_defaults(func=replay)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    # Change to project root directory
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(project_root)
+
+    main()
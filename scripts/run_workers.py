@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Start N evaluation worker processes for multi-process deployment mode.
+
+    DEPLOYMENT_MODE=multiprocess uvicorn app.main:app --workers 4
+    python scripts/run_workers.py --workers 4
+
+API and worker processes share the SQLite job store / queue (SHARED_DB).
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import load_env
+
+load_env()
+
+from app.core.worker import WORKER_CONCURRENCY
+
+
+def run_worker_process(threads: int):
+    """Entry point of one worker process."""
+    from app.ai.evaluator import full_evaluation_pipeline
+    from app.core.worker import ProcessWorker
+    from app.storage.jobs_store import SharedJobStore
+
+    worker = ProcessWorker(SharedJobStore(), full_evaluation_pipeline, concurrency=threads)
+    print(
+        f"👷 Worker {worker.worker_id} started ({threads} threads, "
+        f"checkpoints in {worker.checkpoint_store.db_path})"
+    )
+    worker.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run evaluation worker processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=WORKER_CONCURRENCY,
+                        help="threads per process, for overlapping LLM calls")
+    args = parser.parse_args()
+
+    processes = []
+    for _ in range(args.workers):
+        process = multiprocessing.Process(target=run_worker_process, args=(args.threads,))
+        process.start()
+        processes.append(process)
+
+    print(f"✅ Started {len(processes)} worker process(es)")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping workers...")
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    # Change to project root directory
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(project_root)
+
+    main()
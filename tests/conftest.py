@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
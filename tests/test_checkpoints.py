@@ -0,0 +1,119 @@
+# tests/test_checkpoints.py
+
+import threading
+import time
+
+import pytest
+
+from app.core.job_manager import JobManager, JobStatus
+from app.core.worker import AsyncWorker, ProcessWorker
+from app.storage.file_store import ResultStore
+from app.storage.jobs_store import CheckpointStore, SharedJobStore, StageCheckpoint
+from app.utils.pdf_reader import NoPageCache
+
+
+@pytest.fixture
+def checkpoints(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+def test_stage_checkpoint_skips_completed_stages(checkpoints):
+    calls = []
+
+    def stage(name):
+        calls.append(name)
+        return {"stage": name}
+
+    first = StageCheckpoint(checkpoints, "job-1")
+    first.run("cv", lambda: stage("cv"))
+    first.run("project", lambda: stage("project"), should_save=lambda output: False)
+
+    resumed = StageCheckpoint(checkpoints, "job-1")
+    assert resumed.completed_stages() == ["cv"]
+    assert resumed.run("cv", lambda: stage("cv-again")) == {"stage": "cv"}
+    resumed.run("project", lambda: stage("project"))
+    assert calls == ["cv", "project", "project"]
+
+
+def test_finish_job_clears_spec_and_stages(checkpoints):
+    checkpoints.save_job("job-1", {"job_title": "Backend"})
+    checkpoints.save_stage("job-1", "cv", "text")
+    checkpoints.save_job("job-2", {"job_title": "Frontend"})
+
+    checkpoints.finish_job("job-1")
+
+    assert checkpoints.load_stages("job-1") == {}
+    assert [job_id for job_id, _ in checkpoints.pending_jobs()] == ["job-2"]
+
+
+def make_worker(tmp_path, checkpoints) -> AsyncWorker:
+    manager = JobManager(result_store=ResultStore(str(tmp_path / "results")))
+    return AsyncWorker(manager, page_cache=NoPageCache(), concurrency=1, checkpoint_store=checkpoints)
+
+
+def test_recover_resumes_from_checkpointed_stages(tmp_path, checkpoints):
+    # Interrupted after parsing: the PDFs are gone, so re-parsing would fail
+    checkpoints.save_job("job-1", {
+        "cv_pdf_path": str(tmp_path / "missing_cv.pdf"),
+        "project_pdf_path": str(tmp_path / "missing_project.pdf"),
+        "job_title": "Backend",
+        "priority": "bulk",
+        "tenant": "acme",
+    })
+    checkpoints.save_stage("job-1", "cv_text", "cv text")
+    checkpoints.save_stage("job-1", "project_text", "project text")
+    checkpoints.save_stage("job-1", "cv_evaluation", {"cv_match_rate": 0.7})
+
+    done = threading.Event()
+    seen = {}
+
+    def task_fn(cv_text, project_text, job_title, checkpoint=None):
+        seen.update(
+            cv_text=cv_text,
+            project_text=project_text,
+            job_title=job_title,
+            cv_evaluation=checkpoint.run("cv_evaluation", lambda: {"cv_match_rate": 0.0})
+        )
+        done.set()
+        return {"cv_match_rate": 0.7, "project_score": 4.0}
+
+    worker = make_worker(tmp_path, checkpoints)
+    assert worker.recover(task_fn) == 1
+    assert done.wait(5)
+
+    assert seen == {
+        "cv_text": "cv text",
+        "project_text": "project text",
+        "job_title": "Backend",
+        "cv_evaluation": {"cv_match_rate": 0.7},
+    }
+    job = worker.job_manager.get_job("job-1")
+    for _ in range(200):
+        if job.status is JobStatus.COMPLETED and not checkpoints.pending_jobs():
+            break
+        time.sleep(0.01)
+    assert job.status is JobStatus.COMPLETED
+    assert checkpoints.pending_jobs() == []
+
+
+def test_recover_without_pending_jobs(tmp_path, checkpoints):
+    assert make_worker(tmp_path, checkpoints).recover(lambda *args, **kwargs: {}) == 0
+
+
+def test_lost_claim_keeps_checkpoints_for_new_owner(tmp_path, checkpoints):
+    store = SharedJobStore(str(tmp_path / "shared.db"), tenant_weights={})
+    worker = ProcessWorker(
+        store,
+        task_fn=lambda *args, **kwargs: {"cv_match_rate": 0.5},
+        page_cache=NoPageCache(),
+        checkpoint_store=checkpoints
+    )
+    worker.job_manager.restore_job("job-1", "Backend")
+    checkpoints.save_stage("job-1", "cv_text", "cv text")
+    checkpoints.save_stage("job-1", "project_text", "project text")
+
+    # No claim is held for job-1, as after an expired lease
+    worker._execute("job-1", "cv.pdf", "project.pdf", worker.task_fn, "Backend")
+
+    assert worker.job_manager.get_job("job-1").status is JobStatus.PROCESSING
+    assert set(checkpoints.load_stages("job-1")) == {"cv_text", "project_text"}
@@ -0,0 +1,148 @@
+# tests/test_dedup.py
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.jobs as jobs_api
+from app.core.job_manager import JobManager, SharedJobManager, IdempotencyKeyConflict
+from app.storage.file_store import ResultStore
+from app.storage.jobs_store import SharedJobStore
+
+
+@pytest.fixture(params=["memory", "shared"])
+def manager(request, tmp_path):
+    if request.param == "memory":
+        return JobManager(result_store=ResultStore(str(tmp_path / "results")))
+    return SharedJobManager(SharedJobStore(str(tmp_path / "shared.db")))
+
+
+def test_same_payload_reuses_job(manager):
+    job_id, created = manager.get_or_create_job("payload-a", job_title="Backend")
+    again, created_again = manager.get_or_create_job("payload-a", job_title="Backend")
+
+    assert created and not created_again
+    assert again == job_id
+
+
+def test_completed_job_is_reused(manager):
+    job_id, _ = manager.get_or_create_job("payload-a")
+    manager.set_completed(job_id, {"cv_match_rate": 0.8, "project_score": 4.0})
+
+    assert manager.get_or_create_job("payload-a") == (job_id, False)
+
+
+def test_failed_job_is_not_reused(manager):
+    job_id, _ = manager.get_or_create_job("payload-a")
+    manager.set_failed(job_id, "boom")
+
+    retry_id, created = manager.get_or_create_job("payload-a")
+    assert created
+    assert retry_id != job_id
+
+
+def test_idempotency_key_returns_same_job(manager):
+    job_id, _ = manager.get_or_create_job("payload-a", idempotency_key="key-1")
+
+    assert manager.get_or_create_job("payload-a", idempotency_key="key-1") == (job_id, False)
+
+
+def test_idempotency_key_resolved_by_dedup_is_remembered(manager):
+    job_id, _ = manager.get_or_create_job("payload-a")
+    assert manager.get_or_create_job("payload-a", idempotency_key="key-1") == (job_id, False)
+
+    with pytest.raises(IdempotencyKeyConflict):
+        manager.get_or_create_job("payload-b", idempotency_key="key-1")
+
+
+def test_idempotency_key_with_different_payload_conflicts(manager):
+    manager.get_or_create_job("payload-a", idempotency_key="key-1")
+
+    with pytest.raises(IdempotencyKeyConflict):
+        manager.get_or_create_job("payload-b", idempotency_key="key-1")
+
+
+def test_keys_expire_after_ttl(manager, monkeypatch):
+    manager.dedup_ttl = 60
+    job_id, _ = manager.get_or_create_job("payload-a", idempotency_key="key-1")
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    new_id, created = manager.get_or_create_job("payload-b", idempotency_key="key-1")
+    assert created and new_id != job_id
+    assert manager.get_or_create_job("payload-a")[1]
+
+
+class FakeWorker:
+    def __init__(self):
+        self.jobs = []
+
+    def run_job(self, job_id: str, **kwargs):
+        self.jobs.append(job_id)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    manager = JobManager(result_store=ResultStore(str(tmp_path / "results")))
+    worker = FakeWorker()
+    monkeypatch.setattr(jobs_api, "job_manager", manager)
+    monkeypatch.setattr(jobs_api, "worker", worker)
+    monkeypatch.setattr(jobs_api, "UPLOAD_DIR", tmp_path / "uploads")
+
+    app = FastAPI()
+    app.include_router(jobs_api.router)
+    client = TestClient(app)
+    client.manager = manager
+    client.worker = worker
+    return client
+
+
+def upload(client, cv: bytes, project: bytes, key: str = None):
+    headers = {"Idempotency-Key": key} if key else {}
+    return client.post(
+        "/jobs/upload",
+        files={
+            "cv_pdf": ("cv.pdf", cv, "application/pdf"),
+            "project_report": ("project.pdf", project, "application/pdf"),
+        },
+        headers=headers
+    )
+
+
+def test_upload_deduplicates_identical_files(client):
+    first = upload(client, b"cv", b"project")
+    second = upload(client, b"cv", b"project")
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert second.json()["deduplicated"]
+    assert second.json()["job_id"] == first.json()["job_id"]
+    assert client.worker.jobs == [first.json()["job_id"]]
+
+
+def test_upload_rejects_reused_idempotency_key_with_409(client):
+    first = upload(client, b"cv", b"project", key="key-1")
+    again = upload(client, b"cv", b"project", key="key-1")
+    conflict = upload(client, b"other cv", b"project", key="key-1")
+
+    assert first.status_code == 200
+    assert again.json()["job_id"] == first.json()["job_id"]
+    assert conflict.status_code == 409
+    assert len(client.worker.jobs) == 1
+
+
+def test_failed_upload_write_leaves_no_job(client, monkeypatch):
+    def broken_write(self, data):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("pathlib.Path.write_bytes", broken_write)
+        with pytest.raises(OSError):
+            upload(client, b"cv", b"project")
+
+    assert sum(client.manager.status_counts().values()) == 0
+    retry = upload(client, b"cv", b"project")
+    assert retry.status_code == 200
+    assert "deduplicated" not in retry.json()
@@ -0,0 +1,108 @@
+# tests/test_job_listing.py
+
+import pytest
+
+from app.core.job_manager import JobManager, JobStatus, SharedJobManager
+from app.storage.file_store import ResultStore
+from app.storage.jobs_store import SharedJobStore
+
+
+@pytest.fixture(params=["memory", "shared"])
+def manager(request, tmp_path):
+    if request.param == "memory":
+        return JobManager(result_store=ResultStore(str(tmp_path / "results")))
+    return SharedJobManager(SharedJobStore(str(tmp_path / "shared.db")))
+
+
+def list_all(manager, limit: int, **filters) -> list:
+    jobs, cursor, pages = [], None, 0
+    while True:
+        page, cursor = manager.list_jobs(limit=limit, cursor=cursor, **filters)
+        jobs.extend(job.job_id for job in page)
+        pages += 1
+        assert pages < 100, "cursor did not advance"
+        if cursor is None:
+            return jobs
+
+
+def test_pages_cover_every_job_once_newest_first(manager):
+    created = [manager.create_job("Backend") for _ in range(7)]
+
+    first, cursor = manager.list_jobs(limit=3)
+    assert [job.job_id for job in first] == created[::-1][:3]
+    assert cursor is not None
+
+    assert list_all(manager, limit=3) == created[::-1]
+
+
+def test_last_page_has_no_cursor(manager):
+    for _ in range(2):
+        manager.create_job()
+
+    page, cursor = manager.list_jobs(limit=5)
+    assert len(page) == 2
+    assert cursor is None
+
+
+def test_updated_job_moves_to_front(manager):
+    created = [manager.create_job() for _ in range(3)]
+    manager.set_processing(created[0])
+
+    page, _ = manager.list_jobs(limit=10)
+    assert [job.job_id for job in page] == [created[0], created[2], created[1]]
+
+
+def test_job_updated_during_paging_is_not_repeated(manager):
+    created = [manager.create_job() for _ in range(6)]
+    first, cursor = manager.list_jobs(limit=3)
+    manager.set_processing(first[0].job_id)
+
+    rest = []
+    while cursor is not None:
+        page, cursor = manager.list_jobs(limit=3, cursor=cursor)
+        rest.extend(job.job_id for job in page)
+
+    seen = [job.job_id for job in first] + rest
+    assert sorted(seen) == sorted(created)
+
+
+def test_filters_by_status_and_title(manager):
+    backend = [manager.create_job("Backend") for _ in range(3)]
+    frontend = [manager.create_job("Frontend") for _ in range(2)]
+    manager.set_completed(backend[0], {"cv_match_rate": 0.9, "project_score": 4.5})
+    manager.set_failed(frontend[0], "boom")
+
+    assert list_all(manager, limit=2, job_title="Frontend") == [frontend[0], frontend[1]]
+    assert list_all(manager, limit=2, status=JobStatus.QUEUED) == [frontend[1], backend[2], backend[1]]
+    assert list_all(manager, limit=2, status=JobStatus.COMPLETED, job_title="Backend") == [backend[0]]
+    assert list_all(manager, limit=2, status=JobStatus.COMPLETED, job_title="Frontend") == []
+    assert manager.status_counts() == {"queued": 3, "processing": 0, "completed": 1, "failed": 1}
+
+
+def test_filters_by_update_time(manager):
+    created = [manager.create_job() for _ in range(4)]
+    times = [manager.get_job(job_id).updated_at for job_id in created]
+
+    page, _ = manager.list_jobs(since=times[1], until=times[2])
+    assert [job.job_id for job in page] == [created[2], created[1]]
+
+
+def test_invalid_cursor_raises_value_error(manager):
+    manager.create_job()
+    with pytest.raises(ValueError):
+        manager.list_jobs(cursor="not-a-cursor")
+
+
+def test_evicted_jobs_leave_the_listing(tmp_path):
+    # Negative retention: finished jobs are due as soon as they finish
+    manager = JobManager(result_store=ResultStore(str(tmp_path / "results")), job_retention=-1)
+    old = manager.create_job()
+    manager.set_completed(old, {"cv_match_rate": 0.5, "project_score": 3.0})
+
+    # Eviction runs on updates
+    new = manager.create_job()
+    manager.set_processing(new)
+
+    assert list_all(manager, limit=10) == [new]
+    assert manager.get_job(old) is None
+    assert manager.status_counts()["completed"] == 0
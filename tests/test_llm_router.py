@@ -0,0 +1,165 @@
+# tests/test_llm_router.py
+
+import threading
+import time
+
+import pytest
+
+from app.ai.limiter import AdaptiveLimiter
+from app.ai.llm_client import ModelRouter
+
+
+class StubModels:
+    """
+    Local stand-in for the provider: per-model behaviour, call log.
+    A behaviour is a reply string, an exception to raise, or a callable.
+    """
+
+    def __init__(self, **behaviour):
+        self.behaviour = behaviour
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, model: str, prompt: str) -> str:
+        with self._lock:
+            self.calls.append(model)
+        action = self.behaviour[model]
+        if isinstance(action, Exception):
+            raise action
+        if callable(action):
+            return action()
+        return action
+
+
+def make_router(stub: StubModels, limit: int = 4, **kwargs) -> ModelRouter:
+    options = {
+        "routes": {"cv": ["primary", "backup"], "default": ["primary"]},
+        "latency_threshold": 1.0,
+        "error_threshold": 0.5,
+        "hedge_delay": 0,
+        "min_samples": 3,
+        "limiter": AdaptiveLimiter(initial_limit=limit, min_limit=1, max_limit=limit),
+    }
+    options.update(kwargs)
+    return ModelRouter(complete_fn=stub, **options)
+
+
+def wait_until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def test_fails_over_to_next_model_on_error():
+    stub = StubModels(primary=RuntimeError("boom"), backup="from backup")
+    router = make_router(stub)
+
+    assert router.call("prompt", stage="cv") == "from backup"
+    assert stub.calls == ["primary", "backup"]
+    assert router.stats()["primary"]["error_rate"] == 1.0
+
+
+def test_raises_last_error_when_every_model_fails():
+    stub = StubModels(primary=RuntimeError("primary down"), backup=RuntimeError("backup down"))
+    router = make_router(stub)
+
+    with pytest.raises(RuntimeError, match="backup down"):
+        router.call("prompt", stage="cv")
+
+
+def test_unknown_stage_uses_default_route():
+    stub = StubModels(primary="ok")
+    router = make_router(stub)
+
+    assert router.call("prompt", stage="summary") == "ok"
+    assert stub.calls == ["primary"]
+
+
+def test_empty_default_route_is_rejected():
+    with pytest.raises(ValueError, match="default"):
+        make_router(StubModels(), routes={"cv": ["primary"], "default": []})
+
+
+def test_slow_model_is_demoted_by_p95():
+    stub = StubModels(primary="slow", backup="fast")
+    router = make_router(stub)
+    for _ in range(3):
+        router._get_stats("primary").record(5.0, ok=True)
+
+    assert router.candidates("cv") == ["backup", "primary"]
+    assert router.call("prompt", stage="cv") == "fast"
+    assert stub.calls == ["backup"]
+
+
+def test_failing_model_is_demoted_by_error_rate():
+    stub = StubModels(primary=RuntimeError("flaky"), backup="ok")
+    router = make_router(stub)
+
+    for _ in range(3):
+        assert router.call("prompt", stage="cv") == "ok"
+    stub.calls.clear()
+
+    # Three failures out of three: primary is now tried last
+    assert not router.is_healthy("primary")
+    assert router.call("prompt", stage="cv") == "ok"
+    assert stub.calls == ["backup"]
+
+
+def test_demotion_needs_min_samples():
+    router = make_router(StubModels())
+    for _ in range(2):
+        router._get_stats("primary").record(5.0, ok=False)
+
+    assert router.is_healthy("primary")
+
+
+def test_hedge_returns_backup_when_primary_is_slow():
+    release = threading.Event()
+    stub = StubModels(primary=lambda: release.wait(2) and "primary", backup="backup")
+    router = make_router(stub, hedge_delay=0.05)
+
+    try:
+        assert router.call("prompt", stage="cv") == "backup"
+        assert stub.calls == ["primary", "backup"]
+    finally:
+        release.set()
+
+
+def test_hedge_keeps_primary_when_backup_fails():
+    stub = StubModels(
+        primary=lambda: time.sleep(0.2) or "primary",
+        backup=RuntimeError("backup down")
+    )
+    router = make_router(stub, hedge_delay=0.05)
+
+    assert router.call("prompt", stage="cv") == "primary"
+    assert stub.calls == ["primary", "backup"]
+
+
+def test_no_hedge_without_a_spare_slot():
+    stub = StubModels(primary=lambda: time.sleep(0.2) or "primary", backup="backup")
+    router = make_router(stub, limit=1, hedge_delay=0.05)
+
+    assert router.call("prompt", stage="cv") == "primary"
+    assert stub.calls == ["primary"]
+
+
+def test_limiter_slots_are_released():
+    release = threading.Event()
+    stub = StubModels(primary=lambda: release.wait(2) and "primary", backup="backup")
+    router = make_router(stub, hedge_delay=0.05)
+
+    # Hedged call: the caller's slot and the hedge's slot are both returned,
+    # even though the losing primary request is still running
+    assert router.call("prompt", stage="cv") == "backup"
+    assert router.limiter.stats()["in_flight"] == 0
+    release.set()
+
+    stub.behaviour["primary"] = RuntimeError("down")
+    stub.behaviour["backup"] = RuntimeError("down")
+    with pytest.raises(RuntimeError):
+        router.call("prompt", stage="cv")
+
+    wait_until(lambda: router.limiter.stats()["in_flight"] == 0)
@@ -0,0 +1,31 @@
+# tests/test_pdf_reader.py
+
+import os
+import time
+
+from app.utils.pdf_reader import PageTextCache
+
+
+def test_page_cache_reads_environment_when_created(tmp_path, monkeypatch):
+    monkeypatch.setenv("PAGE_CACHE_DIR", str(tmp_path / "pages"))
+    monkeypatch.setenv("PAGE_CACHE_MAX_DOCS", "5")
+    monkeypatch.setenv("PAGE_CACHE_MAX_AGE", "60")
+
+    cache = PageTextCache()
+    assert cache.cache_dir == tmp_path / "pages"
+    assert (cache.max_docs, cache.max_age) == (5, 60.0)
+
+    # Explicit arguments win, including zero
+    assert PageTextCache(max_docs=0).max_docs == 0
+
+
+def test_page_cache_evicts_least_recently_used(tmp_path):
+    cache = PageTextCache(str(tmp_path), max_docs=2)
+    now = time.time()
+    for age, doc in ((100, "a"), (50, "b")):
+        cache.put(doc, 0, f"page of {doc}")
+        os.utime(tmp_path / doc, (now - age, now - age))
+    cache.put("c", 0, "page of c")
+
+    assert cache.get("a", 0) is None
+    assert cache.get("c", 0) == "page of c"
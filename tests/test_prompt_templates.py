@@ -0,0 +1,48 @@
+# tests/test_prompt_templates.py
+
+import os
+
+import pytest
+
+from app.rag.prompt_templates import PromptTemplateEngine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    (tmp_path / "greeting.txt").write_text("Rubric for {{ROLE}}.\n{{CANDIDATE_NAME}}", encoding="utf-8")
+    return PromptTemplateEngine(tmp_path, reload_interval=0)
+
+
+def test_render_is_cached_prefix_plus_candidate_suffix(engine):
+    prompt = engine.render("greeting", {"ROLE": "Backend"}, {"CANDIDATE_NAME": "Ada"})
+
+    assert prompt == "Rubric for Backend.\nAda"
+    assert engine.get("greeting").render_prefix({"ROLE": "Backend"}) == "Rubric for Backend.\n"
+
+
+def test_changed_template_is_reloaded(engine, tmp_path):
+    engine.render("greeting", {"ROLE": "Backend"}, {"CANDIDATE_NAME": "Ada"})
+    path = tmp_path / "greeting.txt"
+    path.write_text("New rubric for {{ROLE}}.\n{{CANDIDATE_NAME}}", encoding="utf-8")
+    stat = path.stat()
+    # Force a new mtime even on filesystems with coarse timestamps
+    os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+
+    assert engine.render("greeting", {"ROLE": "Backend"}, {"CANDIDATE_NAME": "Ada"}) == (
+        "New rubric for Backend.\nAda"
+    )
+    assert engine.get("greeting").generation == 2
+
+
+def test_deleted_template_is_evicted(engine, tmp_path):
+    engine.render("greeting", {"ROLE": "Backend"}, {"CANDIDATE_NAME": "Ada"})
+    (tmp_path / "greeting.txt").unlink()
+
+    with pytest.raises(KeyError):
+        engine.get("greeting")
+    assert not engine._prefix_cache
+
+
+def test_missing_value_names_the_placeholder(engine):
+    with pytest.raises(KeyError, match="CANDIDATE_NAME"):
+        engine.render("greeting", {"ROLE": "Backend"}, {})
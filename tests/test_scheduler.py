@@ -0,0 +1,145 @@
+# tests/test_scheduler.py
+
+import random
+
+import pytest
+
+from app.core.scheduler import FairScheduler, Priority, parse_tenant_weights
+from app.storage.jobs_store import SharedJobStore
+
+
+def drain(scheduler: FairScheduler) -> list:
+    items = []
+    while True:
+        item = scheduler.get(timeout=0)
+        if item is None:
+            return items
+        items.append(item)
+
+
+def test_interactive_is_served_before_bulk():
+    scheduler = FairScheduler(bulk_max_wait=60, weights={})
+    scheduler.put("b1", Priority.BULK)
+    scheduler.put("b2", Priority.BULK)
+    for i in range(3):
+        scheduler.put(f"i{i}", Priority.INTERACTIVE)
+
+    assert drain(scheduler) == ["i0", "i1", "i2", "b1", "b2"]
+
+
+def test_aged_bulk_gets_one_in_every_interval_dispatches():
+    scheduler = FairScheduler(bulk_max_wait=0, aged_bulk_interval=2, weights={})
+    scheduler.put("b1", Priority.BULK)
+    scheduler.put("b2", Priority.BULK)
+    for i in range(4):
+        scheduler.put(f"i{i}", Priority.INTERACTIVE)
+
+    assert drain(scheduler) == ["i0", "b1", "i1", "b2", "i2", "i3"]
+
+
+def test_tenants_share_a_class_by_weight():
+    scheduler = FairScheduler(weights={"a": 2.0})
+    for i in range(6):
+        scheduler.put(f"a{i}", tenant="a")
+    for i in range(6):
+        scheduler.put(f"b{i}", tenant="b")
+
+    first = drain(scheduler)[:6]
+    assert sum(item.startswith("a") for item in first) == 4
+
+
+def test_idle_tenant_does_not_keep_its_usage():
+    scheduler = FairScheduler(weights={})
+    for i in range(5):
+        scheduler.put(f"a{i}", tenant="a")
+    drain(scheduler)
+
+    # The queue drained, so tenant a's earlier burst is forgotten
+    # (ties go to the tenant that was backlogged first)
+    for i in range(2):
+        scheduler.put(f"a{i}", tenant="a")
+        scheduler.put(f"b{i}", tenant="b")
+    assert drain(scheduler) == ["a0", "b0", "a1", "b1"]
+
+
+def test_parse_tenant_weights():
+    assert parse_tenant_weights("acme=4, trial=0.5,") == {"acme": 4.0, "trial": 0.5}
+    with pytest.raises(ValueError):
+        parse_tenant_weights("acme")
+    with pytest.raises(ValueError):
+        parse_tenant_weights("acme=0")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SharedJobStore(str(tmp_path / "shared.db"), tenant_weights={})
+
+
+def claim_all(store: SharedJobStore) -> list:
+    claimed = []
+    while True:
+        claim = store.claim("worker")
+        if claim is None:
+            return claimed
+        job_id, _, token = claim
+        assert store.ack(job_id, token)
+        claimed.append(job_id)
+
+
+def test_shared_store_alternates_tenants(store, monkeypatch):
+    monkeypatch.setattr(random, "random", lambda: 0.99)  # no aged-bulk claims
+    for i in range(3):
+        store.enqueue(f"a{i}", {}, Priority.INTERACTIVE, "a")
+    store.enqueue("b0", {}, Priority.INTERACTIVE, "b")
+
+    assert claim_all(store) == ["a0", "b0", "a1", "a2"]
+    assert store.queue_stats()[Priority.INTERACTIVE]["queued"] == 0
+
+
+def test_shared_store_shares_by_weight(tmp_path, monkeypatch):
+    monkeypatch.setattr(random, "random", lambda: 0.99)
+    store = SharedJobStore(str(tmp_path / "shared.db"), tenant_weights={"a": 2.0})
+    for i in range(6):
+        store.enqueue(f"a{i}", {}, Priority.INTERACTIVE, "a")
+        store.enqueue(f"b{i}", {}, Priority.INTERACTIVE, "b")
+
+    assert sum(job_id.startswith("a") for job_id in claim_all(store)[:6]) == 4
+
+
+def test_shared_store_forgets_idle_tenants(store, monkeypatch):
+    monkeypatch.setattr(random, "random", lambda: 0.99)
+    for i in range(5):
+        store.enqueue(f"a{i}", {}, Priority.INTERACTIVE, "a")
+    claim_all(store)
+
+    # Drained: a's earlier burst is not held against it (ties go by name)
+    store.enqueue("b-new", {}, Priority.INTERACTIVE, "b")
+    store.enqueue("a-new", {}, Priority.INTERACTIVE, "a")
+    assert claim_all(store) == ["a-new", "b-new"]
+
+
+def test_shared_store_claims_interactive_first_unless_bulk_aged(tmp_path, monkeypatch):
+    store = SharedJobStore(str(tmp_path / "shared.db"), bulk_max_wait=0, tenant_weights={})
+    store.enqueue("bulk", {}, Priority.BULK, "a")
+    store.enqueue("interactive", {}, Priority.INTERACTIVE, "a")
+
+    monkeypatch.setattr(random, "random", lambda: 0.99)
+    job_id, _, _ = store.claim("worker")
+    assert job_id == "interactive"
+
+    # An aged bulk job wins the claims picked for aged work
+    store.enqueue("interactive-2", {}, Priority.INTERACTIVE, "a")
+    monkeypatch.setattr(random, "random", lambda: 0.0)
+    job_id, _, _ = store.claim("worker")
+    assert job_id == "bulk"
+
+
+def test_shared_store_lost_claim_cannot_ack(store):
+    store.enqueue("job", {}, Priority.INTERACTIVE, "a")
+    store.lease_seconds = -1  # expires immediately
+    job_id, _, stale_token = store.claim("worker-1")
+    _, _, token = store.claim("worker-2")
+
+    assert not store.ack(job_id, stale_token)
+    assert not store.renew(job_id, stale_token)
+    assert store.ack(job_id, token)